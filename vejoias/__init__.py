@@ -0,0 +1,5 @@
+# Garante que o app Celery é carregado junto com o Django, para que as
+# tasks registradas via shared_task encontrem o broker configurado.
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
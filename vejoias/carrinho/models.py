@@ -8,6 +8,9 @@ from django.core.exceptions import ValidationError
 # Importação corrigida: Uso de models.Model e carregamento lazy de models
 from vejoias.catalog.models import Joia
 
+# Decimal pré-construído para não invocar o parser de string a cada acesso a `total`
+_DEC_ZERO = Decimal('0')
+
 class Carrinho(models.Model):
     """Modelo de Carrinho de Compras."""
     # O ForeignKey usa lazy loading para evitar dependência circular
@@ -37,7 +40,7 @@ class Carrinho(models.Model):
         # Usando Joia.preco para manter a consistência com o código original:
         total = self.itens.aggregate(
             total=Sum(F('quantidade') * F('joia__preco'))
-        )['total'] or Decimal('0')
+        )['total'] or _DEC_ZERO
         return Decimal(total)
 
     @property
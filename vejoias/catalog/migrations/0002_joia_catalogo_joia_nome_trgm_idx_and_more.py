@@ -0,0 +1,25 @@
+# Generated by Django 5.2.17 on 2026-08-29 08:54
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        # Habilita a extensão pg_trgm antes de criar os índices GIN
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='joia',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['nome'], name='catalogo_joia_nome_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='joia',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['descricao'], name='catalogo_joia_desc_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
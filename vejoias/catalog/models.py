@@ -1,3 +1,4 @@
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from django.utils.text import slugify
 
@@ -101,6 +102,12 @@ class Joia(models.Model):
         # unique_together = ('categoria', 'nome') # Removido se for dificultar migrações iniciais, mas mantido se preferir
 
         db_table = 'catalogo_joia' # Nome de tabela específico
+        indexes = [
+            # GIN + pg_trgm: transforma o LIKE '%busca%' da listagem em
+            # index scan (o planner usa trigram para icontains também)
+            GinIndex(fields=['nome'], name='catalogo_joia_nome_trgm_idx', opclasses=['gin_trgm_ops']),
+            GinIndex(fields=['descricao'], name='catalogo_joia_desc_trgm_idx', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         return self.nome
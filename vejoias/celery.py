@@ -0,0 +1,19 @@
+"""
+Configuração do Celery para o projeto Vê Jóias.
+
+Tarefas que não precisam bloquear a resposta HTTP (e-mail, WhatsApp)
+rodam num worker separado: `celery -A vejoias worker -l info`.
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vejoias.settings')
+
+app = Celery('vejoias')
+
+# Lê as configurações CELERY_* do settings.py do Django
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Descobre tasks.py dentro das apps instaladas
+app.autodiscover_tasks()
@@ -0,0 +1,212 @@
+"""
+Fixtures compartilhadas dos testes dos Casos de Uso.
+
+Cada teste recebe fakes/entidades recém-montados, então a suíte pode
+rodar particionada entre processos (pytest-xdist) sem estado
+compartilhado entre testes.
+"""
+import copy
+from decimal import Decimal
+from unittest.mock import create_autospec
+
+import pytest
+
+from vejoias.core.entities import (
+    Carrinho, Endereco, ItemCarrinho, Joia, Pedido, TransacaoPagamento, Usuario
+)
+from vejoias.core.fakes import (
+    FakeCarrinhoRepository,
+    FakeEmailService,
+    FakeJoiaRepository,
+    FakePagamentoGateway,
+    FakePedidoRepository,
+    FakeWhatsappGateway,
+)
+from vejoias.core.ports import ICarrinhoRepository, IJoiaRepository
+
+
+# ====================================================================
+# ENTIDADES DE APOIO
+#
+# Os templates são construídos uma única vez por sessão (por worker do
+# xdist); cada teste recebe um copy.deepcopy e pode mutar à vontade
+# (decrementar estoque, trocar status) sem vazar estado para os testes
+# seguintes nem repagar a construção da entidade a cada teste.
+# ====================================================================
+
+@pytest.fixture(scope='session')
+def _usuario_template():
+    return Usuario(id='user-1', nome='Maria Teste', email='maria@teste.com')
+
+
+@pytest.fixture
+def usuario(_usuario_template):
+    return copy.deepcopy(_usuario_template)
+
+
+@pytest.fixture(scope='session')
+def _joia_ouro_template():
+    return Joia(
+        id='joia-1',
+        nome='Colar de Ouro',
+        slug='colar-de-ouro',
+        descricao='Colar banhado a ouro',
+        preco=Decimal('100.00'),
+        estoque=5,
+        categoria_id='cat-1',
+    )
+
+
+@pytest.fixture
+def joia_ouro(_joia_ouro_template):
+    return copy.deepcopy(_joia_ouro_template)
+
+
+@pytest.fixture(scope='session')
+def _joia_esgotada_template():
+    return Joia(
+        id='joia-2',
+        nome='Anel Esgotado',
+        slug='anel-esgotado',
+        descricao='Anel sem estoque',
+        preco=Decimal('50.00'),
+        estoque=0,
+        categoria_id='cat-1',
+    )
+
+
+@pytest.fixture
+def joia_esgotada(_joia_esgotada_template):
+    return copy.deepcopy(_joia_esgotada_template)
+
+
+@pytest.fixture(scope='session')
+def _carrinho_cheio_template(_usuario_template, _joia_ouro_template):
+    return Carrinho(
+        id='carrinho-1',
+        usuario_id=_usuario_template.id,
+        itens=[
+            ItemCarrinho(
+                joia_id=_joia_ouro_template.id,
+                quantidade=2,
+                preco_unitario=_joia_ouro_template.preco,
+            ),
+        ],
+    )
+
+
+@pytest.fixture
+def carrinho_cheio(_carrinho_cheio_template):
+    return copy.deepcopy(_carrinho_cheio_template)
+
+
+@pytest.fixture(scope='session')
+def endereco_entrega(_usuario_template):
+    # NamedTuple imutável: pode ser compartilhado entre os testes sem cópia.
+    return Endereco(
+        usuario_id=_usuario_template.id,
+        rua='Rua Teste',
+        numero='100',
+        cidade='São Paulo',
+        estado='SP',
+        cep='00000-000',
+    )
+
+
+@pytest.fixture(scope='session')
+def _pedido_pendente_template(_usuario_template, endereco_entrega):
+    return Pedido(
+        id='pedido-101',
+        usuario=_usuario_template,
+        itens=[],
+        status='PENDENTE',
+        total=Decimal('200.00'),
+        tipo_pagamento='BOLETO',
+        endereco_entrega=endereco_entrega,
+        telefone_whatsapp='5511987654321',
+        transacao_id='TRANS-BOL-ABCDE',
+    )
+
+
+@pytest.fixture
+def pedido_pendente(_pedido_pendente_template):
+    return copy.deepcopy(_pedido_pendente_template)
+
+
+# ====================================================================
+# FAKES (REPOSITÓRIOS E GATEWAYS)
+# ====================================================================
+
+@pytest.fixture
+def joia_repo(joia_ouro, joia_esgotada):
+    return FakeJoiaRepository([joia_ouro, joia_esgotada])
+
+
+@pytest.fixture
+def carrinho_repo(carrinho_cheio):
+    return FakeCarrinhoRepository(carrinho_cheio)
+
+
+@pytest.fixture
+def pedido_repo(pedido_pendente):
+    return FakePedidoRepository([pedido_pendente])
+
+
+@pytest.fixture
+def pagamento_gateway():
+    return FakePagamentoGateway()
+
+
+@pytest.fixture
+def email_service():
+    return FakeEmailService()
+
+
+@pytest.fixture
+def whatsapp_gateway():
+    return FakeWhatsappGateway()
+
+
+# ====================================================================
+# MOCKS COM AUTOSPEC (para asserções sobre a chamada em si)
+#
+# create_autospec percorre o Protocol inteiro para montar o spec — caro
+# para repetir em cada teste. O protótipo é construído uma única vez por
+# sessão (por worker do xdist) e cada teste recebe um copy.copy raso,
+# resetado, que continua validando assinatura dos métodos das portas.
+# ====================================================================
+
+def _copia_resetada(prototipo):
+    mock = copy.copy(prototipo)
+    mock.reset_mock(return_value=True, side_effect=True)
+    return mock
+
+
+@pytest.fixture(scope='session')
+def _carrinho_repo_mock_prototipo():
+    return create_autospec(ICarrinhoRepository, instance=True)
+
+
+@pytest.fixture
+def carrinho_repo_mock(_carrinho_repo_mock_prototipo):
+    return _copia_resetada(_carrinho_repo_mock_prototipo)
+
+
+@pytest.fixture(scope='session')
+def _joia_repo_mock_prototipo():
+    return create_autospec(IJoiaRepository, instance=True)
+
+
+@pytest.fixture
+def joia_repo_mock(_joia_repo_mock_prototipo):
+    return _copia_resetada(_joia_repo_mock_prototipo)
+
+
+@pytest.fixture
+def transacao_aprovada(pedido_pendente):
+    return TransacaoPagamento(
+        referencia_externa=pedido_pendente.transacao_id,
+        status_pagamento='APROVADO',
+        valor=pedido_pendente.total,
+        metodo='BOLETO',
+    )
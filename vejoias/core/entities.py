@@ -1,34 +1,99 @@
 from dataclasses import dataclass, field
 from decimal import Decimal
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import Final, List, NamedTuple, Optional, Dict
+import sys
 import uuid
 
+__all__ = [
+    # Entidades
+    'Usuario', 'Endereco', 'Categoria', 'Subcategoria', 'Joia',
+    'ItemCarrinho', 'Carrinho', 'ItemPedido', 'TransacaoPagamento', 'Pedido',
+    # Vocabulário de status
+    'STATUS_AGUARDANDO_PAGAMENTO', 'STATUS_PAGO', 'STATUS_PROCESSANDO',
+    'STATUS_ENVIADO', 'STATUS_ENTREGUE', 'STATUS_APROVADO', 'STATUS_PENDENTE',
+    'STATUS_REJEITADO', 'STATUS_ESTORNADO', 'STATUS_CANCELADO',
+    'METODO_PIX', 'METODO_BOLETO', 'METODO_CARTAO',
+]
+
+# ====================================================================
+# VOCABULÁRIO DE STATUS (strings internadas)
+# Status e métodos de pagamento formam conjuntos fixos de baixa
+# cardinalidade. Internar essas strings faz com que todas as entidades
+# compartilhem um único objeto str por valor, economizando memória em
+# listagens de pedidos e acelerando comparações de igualdade.
+# ====================================================================
+
+# Status de Pedido
+STATUS_AGUARDANDO_PAGAMENTO: Final = sys.intern("AGUARDANDO_PAGAMENTO")
+STATUS_PAGO: Final = sys.intern("PAGO")
+STATUS_PROCESSANDO: Final = sys.intern("PROCESSANDO")
+STATUS_ENVIADO: Final = sys.intern("ENVIADO")
+STATUS_ENTREGUE: Final = sys.intern("ENTREGUE")
+
+# Status de TransacaoPagamento
+STATUS_APROVADO: Final = sys.intern("APROVADO")
+STATUS_PENDENTE: Final = sys.intern("PENDENTE")
+STATUS_REJEITADO: Final = sys.intern("REJEITADO")
+STATUS_ESTORNADO: Final = sys.intern("ESTORNADO")
+STATUS_CANCELADO: Final = sys.intern("CANCELADO")
+
+# Métodos/Tipos de pagamento
+METODO_PIX: Final = sys.intern("PIX")
+METODO_BOLETO: Final = sys.intern("BOLETO")
+METODO_CARTAO: Final = sys.intern("CARTAO")
+
+
 # ====================================================================
 # ENTIDADES CORE
 # Representam os objetos de negócio puros.
+#
+# slots=True em todas as entidades: instâncias sem __dict__ (~160 bytes a
+# menos cada) e acesso a atributo via descritor em C — relevante porque
+# listagens de catálogo/pedidos criam centenas delas por request.
 # ====================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Usuario:
     """Entidade do Usuário, usada como referência para pedidos/carrinhos."""
     nome: str
     email: str
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     
-@dataclass
-class Endereco:
-    """Entidade do Endereço de Entrega/Faturamento."""
+class Endereco(NamedTuple):
+    """
+    Entidade do Endereço de Entrega/Faturamento.
+
+    Snapshot imutável: NamedTuple ocupa menos memória que um dataclass e
+    compara/hasheia via operações de tupla em C, o que barateia listagens
+    de pedidos que carregam um endereço por pedido.
+    """
     usuario_id: str
     rua: str
     numero: str
     cidade: str
     estado: str
     cep: str
-    id: Optional[str] = field(default_factory=lambda: str(uuid.uuid4()))
+    id: Optional[str] = None
     complemento: Optional[str] = None
-    
-@dataclass
+
+    def formatar_endereco_texto(self) -> str:
+        """
+        Retorna o endereço completo como string.
+
+        Monta via ''.join de partes, sem strings intermediárias por campo —
+        chamado por pedido em recibos/faturas, então lotes grandes geram bem
+        menos lixo para o alocador.
+        """
+        partes = [self.rua, ', ', self.numero]
+        if self.complemento:
+            partes.append(', ')
+            partes.append(self.complemento)
+        partes.extend((' - ', self.cidade, '/', self.estado, ' - CEP: ', self.cep))
+        return ''.join(partes)
+
+
+@dataclass(slots=True)
 class Categoria:
     """Entidade de Categoria de produtos."""
     nome: str
@@ -38,7 +103,7 @@ class Categoria:
     em_destaque: bool = False
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
 
-@dataclass
+@dataclass(slots=True)
 class Subcategoria:
     """Entidade de Subcategoria de produtos."""
     nome: str
@@ -46,7 +111,18 @@ class Subcategoria:
     categoria_id: str
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
 
-@dataclass
+# Constantes Decimal pré-construídas: evitam invocar o parser de string do
+# Decimal a cada chamada em caminhos quentes (total de carrinho, subtotais).
+_DEC_ZERO: Final = Decimal('0')
+_DEC_CENT: Final = Decimal('0.01')  # quantum de centavos para normalização
+
+# Cache de multiplicadores por percentual de desconto. A cardinalidade é
+# minúscula (5/10/15/20%...), então cada multiplicador é calculado uma única
+# vez, evitando o caminho int -> str -> Decimal e a divisão por 100 a cada acesso.
+_DESCONTO_MULT: Dict[int, Decimal] = {}
+
+
+@dataclass(slots=True)
 class Joia:
     """Entidade da Joia (Produto) que está sendo vendida."""
     nome: str
@@ -65,15 +141,26 @@ class Joia:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     data_criacao: datetime = field(default_factory=datetime.now)
     data_atualizacao: Optional[datetime] = None
-    
+
+    def __post_init__(self):
+        """Normaliza o preço para Decimal com 2 casas (aceita float/str/int)."""
+        # Misturar float e Decimal nas contas de total levanta TypeError;
+        # normalizar na borda garante Decimal em toda a aritmética monetária.
+        if not isinstance(self.preco, Decimal):
+            self.preco = Decimal(str(self.preco))
+        self.preco = self.preco.quantize(_DEC_CENT)
+
     @property
     def preco_com_desconto(self) -> Decimal:
         """Calcula o preço com desconto."""
         if self.desconto:
-            return self.preco * (Decimal('1') - Decimal(str(self.desconto)) / Decimal('100'))
+            mult = _DESCONTO_MULT.get(self.desconto)
+            if mult is None:
+                mult = _DESCONTO_MULT[self.desconto] = Decimal(100 - self.desconto) / Decimal(100)
+            return self.preco * mult
         return self.preco
 
-@dataclass
+@dataclass(slots=True)
 class ItemCarrinho:
     """Entidade que representa um item no carrinho."""
     joia_id: str
@@ -82,41 +169,114 @@ class ItemCarrinho:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     joia: Optional[Joia] = None
 
+    def __post_init__(self):
+        """Normaliza o preço unitário para Decimal com 2 casas."""
+        if not isinstance(self.preco_unitario, Decimal):
+            self.preco_unitario = Decimal(str(self.preco_unitario))
+        self.preco_unitario = self.preco_unitario.quantize(_DEC_CENT)
+
     @property
     def subtotal(self) -> Decimal:
         """Calcula o subtotal do item."""
         return self.preco_unitario * self.quantidade
 
-@dataclass
 class Carrinho:
-    """Entidade do Carrinho de Compras."""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
-    usuario_id: Optional[str] = None
-    sessao_key: Optional[str] = None
-    data_criacao: datetime = field(default_factory=datetime.now)
-    data_atualizacao: Optional[datetime] = None
-    itens: List[ItemCarrinho] = field(default_factory=list)
+    """
+    Entidade do Carrinho de Compras.
+
+    Internamente os itens ficam num dict indexado por joia_id: buscar,
+    atualizar e remover um item são O(1) mesmo em carrinhos grandes (antes
+    a lista era varrida linearmente a cada operação). O dict preserva a
+    ordem de inserção, então `itens` continua saindo na ordem de sempre.
+    """
+
+    __slots__ = (
+        'id', 'usuario_id', 'sessao_key', 'data_criacao', 'data_atualizacao',
+        '_itens', '_total',
+    )
+
+    def __init__(
+        self,
+        id: Optional[str] = None,
+        usuario_id: Optional[str] = None,
+        sessao_key: Optional[str] = None,
+        data_criacao: Optional[datetime] = None,
+        data_atualizacao: Optional[datetime] = None,
+        itens: Optional[List[ItemCarrinho]] = None,
+    ):
+        self.id = id if id is not None else str(uuid.uuid4())
+        self.usuario_id = usuario_id
+        self.sessao_key = sessao_key
+        self.data_criacao = data_criacao if data_criacao is not None else datetime.now()
+        self.data_atualizacao = data_atualizacao
+        self._itens: Dict[str, ItemCarrinho] = {}
+        # Total mantido incrementalmente pelos métodos de mutação: consultar
+        # o total vira O(1) em vez de re-somar Decimal por item a cada acesso.
+        self._total: Decimal = _DEC_ZERO
+        if itens:
+            for item in itens:
+                self._itens[item.joia_id] = item
+                self._total += item.subtotal
+
+    @property
+    def itens(self) -> List[ItemCarrinho]:
+        """Itens como lista (para iteração/len); mutações vão pelos métodos."""
+        return list(self._itens.values())
 
     @property
     def total(self) -> Decimal:
-        """Calcula o total do carrinho."""
-        return sum(item.subtotal for item in self.itens)
+        """Total do carrinho (cacheado; atualizado a cada mutação)."""
+        return self._total
+
+    def obter_item(self, joia_id: str) -> Optional[ItemCarrinho]:
+        """Busca um item pelo joia_id em O(1)."""
+        return self._itens.get(joia_id)
+
+    def adicionar_item(self, item: ItemCarrinho) -> None:
+        """Adiciona (ou substitui) o item da joia correspondente em O(1)."""
+        anterior = self._itens.get(item.joia_id)
+        if anterior is not None:
+            self._total -= anterior.subtotal
+        self._itens[item.joia_id] = item
+        self._total += item.subtotal
+
+    def atualizar_quantidade(self, joia_id: str, quantidade: int) -> bool:
+        """Ajusta a quantidade de um item existente, mantendo o total em dia."""
+        item = self._itens.get(joia_id)
+        if item is None:
+            return False
+        self._total += item.preco_unitario * (quantidade - item.quantidade)
+        item.quantidade = quantidade
+        return True
+
+    def remover_item(self, joia_id: str) -> bool:
+        """Remove o item da joia em O(1). Retorna True se algo foi removido."""
+        item = self._itens.pop(joia_id, None)
+        if item is None:
+            return False
+        self._total -= item.subtotal
+        return True
+
+
+class ItemPedido(NamedTuple):
+    """
+    Snapshot de um item no momento da compra (imutável).
 
-@dataclass
-class ItemPedido:
-    """Snapshot de um item no momento da compra (imutável)."""
+    NamedTuple: pedidos com muitos itens ocupam menos memória e a
+    iteração/comparação usa as operações de tupla em C.
+    """
     pedido_id: str
     joia_id: str
     nome_produto: str
     preco_unitario: Decimal
     quantidade: int
-    subtotal: Decimal = field(init=False)
 
-    def __post_init__(self):
-        """Calcula o subtotal após a inicialização."""
-        self.subtotal = self.preco_unitario * self.quantidade
+    @property
+    def subtotal(self) -> Decimal:
+        """Calcula o subtotal do item."""
+        return self.preco_unitario * self.quantidade
 
-@dataclass
+@dataclass(slots=True)
 class TransacaoPagamento:
     """Entidade que registra a comunicação com o Gateway de Pagamento."""
     referencia_externa: str # ID da transação no Pagar.me/Stripe etc.
@@ -124,8 +284,14 @@ class TransacaoPagamento:
     valor: Decimal
     metodo: str             # Ex: 'CARTAO', 'PIX'
     data_transacao: datetime = field(default_factory=datetime.now)
-    
-@dataclass
+
+    def __post_init__(self):
+        """Interna os campos de vocabulário fixo para compartilhar um único str por valor."""
+        self.status_pagamento = sys.intern(self.status_pagamento)
+        self.metodo = sys.intern(self.metodo)
+
+
+@dataclass(slots=True)
 class Pedido:
     """Entidade do Pedido de Venda."""
     # Campos obrigatórios
@@ -141,3 +307,8 @@ class Pedido:
     data_pedido: datetime = field(default_factory=datetime.now)
     id: Optional[str] = field(default_factory=lambda: str(uuid.uuid4()))
     data_modificacao: Optional[datetime] = None
+
+    def __post_init__(self):
+        """Interna os campos de vocabulário fixo para compartilhar um único str por valor."""
+        self.status = sys.intern(self.status)
+        self.tipo_pagamento = sys.intern(self.tipo_pagamento)
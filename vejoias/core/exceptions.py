@@ -1,9 +1,11 @@
 class BaseErroCore(Exception):
     """Classe base para todas as exceções da Camada Core."""
-    pass
+    __slots__ = ()
 
 class DadosInvalidosError(BaseErroCore):
     """Erro levantado quando dados inválidos são fornecidos."""
+    __slots__ = ('message',)
+
     def __init__(self, message="Os dados fornecidos são inválidos."):
         self.message = message
         super().__init__(self.message)
@@ -14,38 +16,58 @@ class DadosInvalidosError(BaseErroCore):
 
 class ItemNaoEncontradoError(BaseErroCore):
     """Erro levantado quando um item (genérico) não é encontrado."""
+    __slots__ = ('message',)
+
     def __init__(self, message="O item solicitado não foi encontrado."):
         self.message = message
         super().__init__(self.message)
 
 class JoiaNaoEncontradaError(ItemNaoEncontradoError):
     """Erro levantado quando uma joia específica não é encontrada."""
+    __slots__ = ()
+
     def __init__(self, message="A joia solicitada não foi encontrada."):
-        self.message = message
-        super().__init__(self.message)
-        
+        super().__init__(message)
+
 class PedidoNaoEncontradoError(ItemNaoEncontradoError):
     """Erro específico para Pedidos não encontrados."""
-    pass
+    __slots__ = ()
 
 class UsuarioNaoEncontradoError(ItemNaoEncontradoError):
     """Erro específico para Usuários não encontrados."""
-    pass
+    __slots__ = ()
 
 class EnderecoInvalidoError(BaseErroCore):
     """Erro levantado quando um endereço de entrega é inválido ou não pertence ao usuário."""
-    pass
+    __slots__ = ()
 
 class EstoqueInsuficienteError(BaseErroCore):
-    """Erro levantado quando a quantidade solicitada excede o estoque."""
-    def __init__(self, joia_id: str, estoque_atual: int, quantidade_solicitada: int, message=None):
+    """
+    Erro levantado quando a quantidade solicitada excede o estoque.
+
+    Armazena apenas os campos crus; a mensagem é formatada de forma
+    preguiçosa em __str__, de modo que validações de estoque capturadas e
+    ignoradas (caminho comum em adicionar_item) não paguem o custo do
+    f-string. Aceita também uma mensagem pronta como primeiro argumento,
+    forma usada por alguns chamadores.
+    """
+    __slots__ = ('joia_id', 'estoque_atual', 'quantidade_solicitada', 'message')
+
+    def __init__(self, joia_id=None, estoque_atual=None, quantidade_solicitada=None, message=None):
         self.joia_id = joia_id
         self.estoque_atual = estoque_atual
         self.quantidade_solicitada = quantidade_solicitada
-        if message is None:
-            message = (f"Estoque insuficiente para a Joia {joia_id}. "
-                       f"Disponível: {estoque_atual}, Solicitado: {quantidade_solicitada}.")
-        super().__init__(message)
+        self.message = message
+        super().__init__()
+
+    def __str__(self):
+        if self.message is not None:
+            return self.message
+        if self.estoque_atual is None:
+            # Chamada com mensagem pronta na posição do joia_id
+            return str(self.joia_id) if self.joia_id is not None else "Estoque insuficiente."
+        return (f"Estoque insuficiente para a Joia {self.joia_id}. "
+                f"Disponível: {self.estoque_atual}, Solicitado: {self.quantidade_solicitada}.")
 
 # ===============================================
 # ERROS DE FLUXO DE COMPRA E PAGAMENTO
@@ -53,18 +75,24 @@ class EstoqueInsuficienteError(BaseErroCore):
 
 class CarrinhoVazioError(BaseErroCore):
     """Erro levantado ao tentar fazer checkout com carrinho vazio."""
+    __slots__ = ('message',)
+
     def __init__(self, message="O carrinho de compras está vazio."):
         self.message = message
         super().__init__(self.message)
 
 class PagamentoFalhouError(BaseErroCore):
     """Erro levantado quando o Gateway de Pagamento rejeita a transação."""
+    __slots__ = ('message',)
+
     def __init__(self, message="A transação de pagamento foi rejeitada ou falhou."):
         self.message = message
         super().__init__(self.message)
 
 class StatusInvalidoError(BaseErroCore):
     """Erro levantado ao tentar definir um status de pedido inválido."""
+    __slots__ = ('message',)
+
     def __init__(self, message="O status fornecido não é válido para um pedido."):
         self.message = message
         super().__init__(self.message)
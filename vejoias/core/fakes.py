@@ -0,0 +1,235 @@
+"""
+Fakes leves para os testes dos Casos de Uso.
+
+Substituem o unittest.mock.Mock nos papéis de repositório/gateway: cada
+Mock() aloca atributos-filhos sob demanda via __getattr__ e as asserções
+percorrem a lista de chamadas, o que pesa conforme a suíte cresce. Estes
+fakes são classes simples de dados, seguem os Protocols de
+vejoias/core/ports.py e registram o que importa em listas comuns
+(`salvos`, `enviados`, ...) para as asserções. Reserve o Mock para os
+casos em que a asserção sobre a chamada em si é essencial.
+"""
+from typing import Dict, List, Optional
+
+from vejoias.core.entities import (
+    Carrinho, Categoria, Joia, Pedido, TransacaoPagamento, Usuario
+)
+from vejoias.core.exceptions import PagamentoFalhouError
+
+
+class FakeJoiaRepository:
+    """IJoiaRepository em memória: um dict de joias e a lista do que foi salvo."""
+
+    def __init__(self, joias: Optional[List[Joia]] = None):
+        self.joias: Dict[str, Joia] = {joia.id: joia for joia in (joias or [])}
+        self.salvos: List[Joia] = []
+
+    def buscar_por_id(self, joia_id):
+        return self.joias.get(joia_id)
+
+    def buscar_por_ids(self, joia_ids):
+        return {
+            joia_id: self.joias[joia_id]
+            for joia_id in joia_ids if joia_id in self.joias
+        }
+
+    def buscar_por_criterios(self, em_estoque=True, busca=None, categoria_slug=None,
+                             limite=None, offset=0, em_destaque=False):
+        resultados = list(self.joias.values())
+        if em_estoque:
+            resultados = [joia for joia in resultados if joia.estoque > 0]
+        if em_destaque:
+            resultados = [joia for joia in resultados if joia.em_destaque]
+        if busca:
+            busca = busca.lower()
+            resultados = [
+                joia for joia in resultados
+                if busca in joia.nome.lower() or busca in joia.descricao.lower()
+            ]
+        if limite is not None:
+            return resultados[offset:offset + limite]
+        return resultados
+
+    def salvar(self, joia):
+        self.joias[joia.id] = joia
+        self.salvos.append(joia)
+        return joia
+
+    def atualizar_estoque(self, joia_id, quantidade):
+        joia = self.joias[joia_id]
+        joia.estoque -= quantidade
+
+    def deletar(self, joia_id):
+        self.joias.pop(joia_id, None)
+
+
+class FakeCategoriaRepository:
+    """ICategoriaRepository em memória."""
+
+    def __init__(self, categorias: Optional[List[Categoria]] = None):
+        self.categorias: List[Categoria] = list(categorias or [])
+
+    def buscar_todas(self):
+        return list(self.categorias)
+
+    def buscar_por_slug(self, slug):
+        return next((c for c in self.categorias if c.slug == slug), None)
+
+    def salvar(self, categoria):
+        self.categorias.append(categoria)
+        return categoria
+
+
+class FakeCarrinhoRepository:
+    """ICarrinhoRepository em memória, com registro do que foi persistido."""
+
+    def __init__(self, carrinho: Optional[Carrinho] = None):
+        self.carrinho = carrinho if carrinho is not None else Carrinho()
+        self.salvos: List[Carrinho] = []
+        self.limpos: List[str] = []
+
+    def buscar_ou_criar(self, usuario=None, sessao_key=None):
+        return self.carrinho
+
+    def buscar_por_usuario(self, usuario):
+        return self.carrinho
+
+    def salvar(self, carrinho):
+        self.salvos.append(carrinho)
+        return carrinho
+
+    def salvar_item(self, carrinho, joia_id, quantidade_adicionada):
+        self.salvos.append(carrinho)
+        return carrinho
+
+    def remover_item(self, carrinho, joia_id):
+        carrinho.remover_item(joia_id)
+        self.salvos.append(carrinho)
+        return carrinho
+
+    def limpar_carrinho(self, carrinho_id):
+        self.limpos.append(carrinho_id)
+
+
+class FakePedidoRepository:
+    """IPedidoRepository em memória."""
+
+    def __init__(self, pedidos: Optional[List[Pedido]] = None):
+        self.pedidos: Dict[str, Pedido] = {p.id: p for p in (pedidos or [])}
+        self.salvos: List[Pedido] = []
+        self.estoque_updates: List[list] = []
+
+    def criar_pedido(self, pedido, carrinho_id=None, estoque_updates=None):
+        self.pedidos[pedido.id] = pedido
+        self.salvos.append(pedido)
+        if estoque_updates is not None:
+            self.estoque_updates.append(list(estoque_updates))
+        return pedido
+
+    def salvar(self, pedido):
+        return self.criar_pedido(pedido)
+
+    def buscar_por_id(self, pedido_id):
+        return self.pedidos.get(pedido_id)
+
+    def buscar_por_transacao_id(self, transacao_id):
+        return next(
+            (p for p in self.pedidos.values() if p.transacao_id == transacao_id),
+            None
+        )
+
+    def listar_todos_pedidos(self, status=None):
+        pedidos = list(self.pedidos.values())
+        if status:
+            pedidos = [p for p in pedidos if p.status == status]
+        return pedidos
+
+    def listar_pedidos_por_usuario(self, usuario_id):
+        return [p for p in self.pedidos.values() if p.usuario.id == usuario_id]
+
+    def atualizar_status(self, pedido_id, novo_status, id_externo_pagamento=None):
+        pedido = self.pedidos[pedido_id]
+        pedido.status = novo_status
+        self.salvos.append(pedido)
+        return pedido
+
+
+class FakePagamentoGateway:
+    """
+    IGatewayPagamento determinístico: aprova tudo, a menos que `falhar=True`.
+    Guarda as transações processadas para asserção.
+    """
+
+    def __init__(self, status='APROVADO', falhar=False):
+        self.status = status
+        self.falhar = falhar
+        self.processados: List[TransacaoPagamento] = []
+
+    def processar_pagamento(self, pedido, metodo, usuario=None, dados=None):
+        if self.falhar:
+            raise PagamentoFalhouError("Pagamento recusado (fake).")
+        transacao = TransacaoPagamento(
+            referencia_externa=f"FAKE-{len(self.processados) + 1}",
+            status_pagamento=self.status,
+            valor=pedido.total,
+            metodo=metodo,
+        )
+        self.processados.append(transacao)
+        return transacao
+
+    def verificar_status(self, transacao_id):
+        return next(
+            (t for t in self.processados if t.referencia_externa == transacao_id),
+            None
+        )
+
+
+class FakeEmailService:
+    """IEmailService que só registra os envios."""
+
+    def __init__(self):
+        self.enviados: List[tuple] = []
+
+    def enviar_confirmacao_pedido(self, pedido):
+        self.enviados.append(('confirmacao', pedido.id))
+        return True
+
+    def enviar_aprovacao_pagamento(self, pedido):
+        self.enviados.append(('aprovacao', pedido.id))
+        return True
+
+    def enviar_status_mudanca(self, pedido, novo_status):
+        self.enviados.append(('status', pedido.id, novo_status))
+        return True
+
+
+class FakeNotificacaoTaskQueue:
+    """INotificacaoTaskQueue que só registra o que foi enfileirado."""
+
+    def __init__(self):
+        self.enfileirados: List[tuple] = []
+
+    def enqueue_confirmacao(self, pedido_id, numero_telefone):
+        self.enfileirados.append(('confirmacao', pedido_id, numero_telefone))
+
+    def enqueue_aprovacao(self, pedido_id, numero_telefone):
+        self.enfileirados.append(('aprovacao', pedido_id, numero_telefone))
+
+
+class FakeWhatsappGateway:
+    """IWhatsappGateway que só registra os envios."""
+
+    def __init__(self):
+        self.enviados: List[tuple] = []
+
+    def enviar_confirmacao_pedido(self, pedido, numero_telefone):
+        self.enviados.append(('confirmacao', pedido.id, numero_telefone))
+        return True
+
+    def enviar_aprovacao_pagamento(self, pedido, numero_telefone):
+        self.enviados.append(('aprovacao', pedido.id, numero_telefone))
+        return True
+
+    def enviar_status_mudanca(self, pedido, novo_status, numero_telefone):
+        self.enviados.append(('status', pedido.id, novo_status, numero_telefone))
+        return True
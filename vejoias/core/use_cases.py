@@ -4,13 +4,19 @@ Implementação dos Casos de Uso (Lógica de Negócio) da aplicação.
 Esta camada depende apenas das Entidades e Portas (Interfaces) do Core, 
 garantindo o isolamento da lógica de negócio.
 """
-from typing import List, Optional, Dict
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional, Iterable
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone as dt_timezone
+from types import MappingProxyType
 
 # Entidades e Exceções
 from vejoias.core.entities import (
-    Joia, Carrinho, Categoria, Endereco, Pedido, ItemPedido, Usuario, TransacaoPagamento
+    Joia, Carrinho, Categoria, Endereco, Pedido, ItemPedido, Usuario, TransacaoPagamento,
+    STATUS_PAGO, STATUS_PROCESSANDO, STATUS_ENVIADO, STATUS_ENTREGUE,
+    STATUS_CANCELADO, STATUS_PENDENTE, STATUS_APROVADO, STATUS_REJEITADO,
+    STATUS_ESTORNADO
 )
 from vejoias.core.exceptions import (
     ItemNaoEncontradoError, 
@@ -31,10 +37,62 @@ from vejoias.core.ports import (
     IUsuarioRepository,
     IGatewayPagamento,
     IEmailService,
-    IWhatsappGateway
+    IWhatsappGateway,
+    INotificacaoTaskQueue
 )
 
 
+# Pool compartilhado para notificações: e-mail e WhatsApp vão para
+# provedores independentes (SMTP/Evolution API), então os dois RTTs podem
+# correr em paralelo — a latência cai de t_email + t_whatsapp para
+# max(t_email, t_whatsapp). Exceções ficam presas nos Futures, preservando
+# o contrato de que falha de notificação não derruba o fluxo principal.
+_NOTIF_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='notificacoes')
+
+logger = logging.getLogger(__name__)
+
+
+def _enviar_notificacao(fn, *args):
+    """Executa um envio no pool; falha vira log estruturado, nunca exceção."""
+    try:
+        fn(*args)
+    except Exception:
+        logger.exception("Falha ao enviar notificação %s.", fn.__name__)
+
+
+def _despachar_notificacoes(notificadores):
+    """
+    Dispara os pares (método, args) em paralelo no pool e espera todos.
+
+    Um único ponto para o padrão "notifica mas não quebra o fluxo":
+    exceções são logadas dentro do worker (formatação preguiçosa via %s,
+    sem print serializando threads no lock do stdout).
+    """
+    wait([
+        _NOTIF_POOL.submit(_enviar_notificacao, fn, *args)
+        for fn, args in notificadores
+    ])
+
+# Mapeamento status da transação (gateway) -> status do pedido. Dict de
+# módulo montado com as constantes internadas de entities.py: resolvido
+# uma vez no import e com comparação de chave caindo no fast path de
+# identidade de ponteiro. O MappingProxyType deixa o mapa somente-leitura
+# — ninguém muta a tabela em runtime por acidente.
+_STATUS_TRANSACAO_PARA_PEDIDO = MappingProxyType({
+    STATUS_APROVADO: STATUS_PAGO,
+    STATUS_PENDENTE: STATUS_PENDENTE,
+    STATUS_REJEITADO: STATUS_CANCELADO,
+    STATUS_ESTORNADO: STATUS_CANCELADO,
+    # Adicionar outros status relevantes
+})
+
+# Conjunto canônico dos status de pedido aceitos na atualização manual.
+_STATUS_VALIDOS = frozenset({
+    STATUS_PAGO, STATUS_PROCESSANDO, STATUS_ENVIADO,
+    STATUS_ENTREGUE, STATUS_CANCELADO, STATUS_PENDENTE,
+})
+
+
 # ====================================================================
 # 1. CASOS DE USO DO CATÁLOGO
 # ====================================================================
@@ -46,16 +104,24 @@ class ListarJoiasUseCase:
         self.categoria_repo = categoria_repo
 
     def listar_joias(
-        self, 
-        busca: Optional[str] = None, 
-        categoria_slug: Optional[str] = None
+        self,
+        busca: Optional[str] = None,
+        categoria_slug: Optional[str] = None,
+        limite: Optional[int] = None,
+        offset: int = 0
     ) -> List[Joia]:
-        """Retorna joias filtradas por busca textual e/ou categoria, excluindo itens sem estoque."""
+        """
+        Retorna joias filtradas por busca textual e/ou categoria, excluindo
+        itens sem estoque. Com `limite`, devolve só a página pedida — a
+        fatia é aplicada no repositório (LIMIT/OFFSET), não em Python.
+        """
         # A lógica de busca complexa é delegada à interface IJoiaRepository
         return self.joia_repo.buscar_por_criterios(
             em_estoque=True, # Sempre busca apenas itens em estoque para o catálogo principal
             busca=busca,
-            categoria_slug=categoria_slug
+            categoria_slug=categoria_slug,
+            limite=limite,
+            offset=offset
         )
         
     def listar_categorias(self) -> List[Categoria]:
@@ -107,7 +173,8 @@ class GerenciarCarrinhoUseCase:
             raise ItemNaoEncontradoError(f"Jóia ID {joia_id} não encontrada.")
 
         # Lógica de validação de estoque
-        item_existente = next((item for item in carrinho.itens if item.joia_id == joia_id), None)
+        # Índice por joia_id do carrinho: O(1) em vez de varrer a lista
+        item_existente = carrinho.obter_item(joia_id)
         quantidade_no_carrinho = item_existente.quantidade if item_existente else 0
         quantidade_total_solicitada = quantidade + quantidade_no_carrinho
         
@@ -124,7 +191,7 @@ class GerenciarCarrinhoUseCase:
     def remover_item(self, carrinho: Carrinho, joia_id: str) -> Carrinho:
         """Remove um item do carrinho completamente."""
         
-        item_para_remover = next((item for item in carrinho.itens if item.joia_id == joia_id), None)
+        item_para_remover = carrinho.obter_item(joia_id)
         
         if not item_para_remover:
             raise ItemNaoEncontradoError("Item não encontrado no carrinho.")
@@ -148,14 +215,16 @@ class CriarPedidoUseCase:
                  joia_repo: IJoiaRepository,
                  pagamento_gateway: IGatewayPagamento,
                  email_service: IEmailService,
-                 whatsapp_gateway: IWhatsappGateway):
-        
+                 whatsapp_gateway: IWhatsappGateway,
+                 task_queue: Optional[INotificacaoTaskQueue] = None):
+
         self.carrinho_repo = carrinho_repo
         self.pedido_repo = pedido_repo
         self.joia_repo = joia_repo
         self.pagamento_gateway = pagamento_gateway
         self.email_service = email_service
         self.whatsapp_gateway = whatsapp_gateway
+        self.task_queue = task_queue
     
     
     def executar(
@@ -174,49 +243,72 @@ class CriarPedidoUseCase:
 
         # Validações de Entidade Endereco (simplificadas aqui)
         endereco_entity = Endereco(
-            cep=dados_entrega.get('cep'),
+            usuario_id=usuario.id,
             rua=dados_entrega.get('rua'),
             numero=dados_entrega.get('numero'),
-            bairro=dados_entrega.get('bairro'),
             cidade=dados_entrega.get('cidade'),
             estado=dados_entrega.get('estado'),
-            referencia=dados_entrega.get('referencia')
+            cep=dados_entrega.get('cep'),
+            complemento=dados_entrega.get('complemento'),
         )
 
         itens_pedido = []
-        total_calculado = Decimal('0.00')
-        
+        # Acumulador em centavos (int): os preços já vêm quantizados em 2
+        # casas, então a conversão é exata e o += no loop vira aritmética
+        # de int puro em vez de alocar um Decimal novo por item.
+        total_centavos = 0
+
         # 1. Snapshot e Checagem de Estoque Final
+        # Busca todas as joias do carrinho num único SELECT (WHERE id IN),
+        # em vez de uma query por item.
+        joias_por_id = self.joia_repo.buscar_por_ids(
+            [item.joia_id for item in carrinho.itens]
+        )
+
+        # Lookups de atributo/método içados para locais: o loop roda uma
+        # vez por item do carrinho e cada LOAD_ATTR repetido custa.
+        obter_joia = joias_por_id.get
+        adicionar_item = itens_pedido.append
+
         for item_carrinho in carrinho.itens:
-            joia = self.joia_repo.buscar_por_id(item_carrinho.joia_id)
-            
+            joia = obter_joia(item_carrinho.joia_id)
+
             if not joia:
                 raise ItemNaoEncontradoError(f"Jóia ID {item_carrinho.joia_id} não encontrada no catálogo.")
-            
-            if joia.estoque < item_carrinho.quantidade:
+
+            quantidade = item_carrinho.quantidade
+            preco = joia.preco
+
+            if joia.estoque < quantidade:
                 raise EstoqueInsuficienteError(
-                    joia_id=joia.id, estoque_atual=joia.estoque, quantidade_solicitada=item_carrinho.quantidade
+                    joia_id=joia.id, estoque_atual=joia.estoque, quantidade_solicitada=quantidade
                 )
-            
-            # Cria o ItemPedido (Snapshot imutável)
-            item_snapshot = ItemPedido(
-                joia_id=joia.id,
-                nome_joia=joia.nome,
-                preco_unitario=joia.preco, # Preço atual no momento do checkout
-                quantidade=item_carrinho.quantidade,
-                subtotal=item_carrinho.quantidade * joia.preco
-            )
-            
-            itens_pedido.append(item_snapshot)
-            total_calculado += item_snapshot.subtotal
 
-        # 2. Prepara a Entidade Pedido inicial
+            # Cria o ItemPedido (Snapshot imutável). O pedido_id só existe
+            # após a persistência; o repositório o associa ao salvar.
+            adicionar_item(ItemPedido(
+                pedido_id=None,
+                joia_id=joia.id,
+                nome_produto=joia.nome,
+                preco_unitario=preco, # Preço atual no momento do checkout
+                quantidade=quantidade,
+            ))
+            total_centavos += int(preco * 100) * quantidade
+
+        # Uma única construção de Decimal para o total, no fim do loop.
+        total_calculado = Decimal(total_centavos).scaleb(-2)
+
+        # 2. Prepara a Entidade Pedido inicial. Timestamp capturado uma vez,
+        # já ciente de fuso (UTC): com USE_TZ ativo o ORM e os serializadores
+        # das notificações não precisam re-localizar um datetime ingênuo.
+        agora = datetime.now(dt_timezone.utc)
+        tipo_pagamento_upper = tipo_pagamento.upper()
         pedido_inicial = Pedido(
-            usuario=usuario, 
-            data_pedido=datetime.now(),
+            usuario=usuario,
+            data_pedido=agora,
             status="AGUARDANDO_PAGAMENTO",
             total=total_calculado,
-            tipo_pagamento=tipo_pagamento.upper(),
+            tipo_pagamento=tipo_pagamento_upper,
             endereco_entrega=endereco_entity,
             telefone_whatsapp=numero_telefone,
             itens=itens_pedido 
@@ -226,7 +318,7 @@ class CriarPedidoUseCase:
         try:
             transacao: TransacaoPagamento = self.pagamento_gateway.processar_pagamento(
                 pedido=pedido_inicial, 
-                metodo=tipo_pagamento.upper(), 
+                metodo=tipo_pagamento_upper,
                 usuario=usuario,
                 dados=dados_pagamento
             )
@@ -238,20 +330,27 @@ class CriarPedidoUseCase:
         pedido_inicial.transacao_id = transacao.referencia_externa
         
         # O PedidoRepository deve criar o pedido, reduzir o estoque e limpar o carrinho ATOMICAMENTE.
+        # Pares (joia_id, quantidade) direto dos snapshots: o repositório
+        # só itera sobre eles, então não há por que montar (e hashear) um
+        # dict intermediário aqui.
         pedido_final = self.pedido_repo.criar_pedido(
-            pedido_inicial, 
-            carrinho.id, 
-            estoque_updates={item.joia_id: item.quantidade for item in itens_pedido}
+            pedido_inicial,
+            carrinho.id,
+            estoque_updates=[(item.joia_id, item.quantidade) for item in itens_pedido]
         )
         
-        # 5. Notificações
-        try:
-            self.email_service.enviar_confirmacao_pedido(pedido_final)
-            self.whatsapp_gateway.enviar_confirmacao_pedido(pedido_final, numero_telefone)
-        except Exception:
-            # Em produção, você logaria isso. Por enquanto, só ignora a falha de notificação.
-            pass
-        
+        # 5. Notificações — com fila configurada, o checkout só enfileira o
+        # ID do pedido e retorna; o worker paga os RTTs de SMTP/WhatsApp.
+        # Sem fila, mantém o envio direto em paralelo (falhas ficam nos
+        # Futures e não quebram o checkout).
+        if self.task_queue is not None:
+            self.task_queue.enqueue_confirmacao(pedido_final.id, numero_telefone)
+        else:
+            _despachar_notificacoes([
+                (self.email_service.enviar_confirmacao_pedido, (pedido_final,)),
+                (self.whatsapp_gateway.enviar_confirmacao_pedido, (pedido_final, numero_telefone)),
+            ])
+
         return pedido_final
 
 
@@ -263,61 +362,72 @@ class AtualizarStatusPedidoPorTransacaoUseCase:
     def __init__(
         self, 
         pedido_repo: IPedidoRepository, 
-        pagamento_gateway: IGatewayPagamento, 
+        pagamento_gateway: IGatewayPagamento,
         email_service: IEmailService,
-        whatsapp_gateway: IWhatsappGateway
+        whatsapp_gateway: IWhatsappGateway,
+        task_queue: Optional[INotificacaoTaskQueue] = None
     ):
         self.pedido_repo = pedido_repo
         self.pagamento_gateway = pagamento_gateway
         self.email_service = email_service
         self.whatsapp_gateway = whatsapp_gateway
+        self.task_queue = task_queue
     
-    # Mapeamento de status internos
-    _STATUS_MAP = {
-        "APROVADO": "PAGO",
-        "PENDENTE": "PENDENTE",
-        "REJEITADO": "CANCELADO",
-        "ESTORNADO": "CANCELADO",
-        # Adicionar outros status relevantes
-    }
-
     def executar(self, transacao_id: str):
-        
+
+        # 1. Resolver o pedido localmente primeiro: um SELECT indexado por
+        # codigo_transacao é ordens de grandeza mais barato que o HTTP de
+        # verificar_status — webhook espúrio/desconhecido nem sai da rede.
+        pedido = self.pedido_repo.buscar_por_transacao_id(transacao_id)
+
+        if not pedido:
+            # Logar que a transação não tem pedido correspondente (pode ser um erro do gateway)
+            return
+
         try:
-            # 1. Buscar o status atual da transação no gateway
+            # 2. Buscar o status atual da transação no gateway
             transacao: TransacaoPagamento = self.pagamento_gateway.verificar_status(transacao_id)
         except Exception:
             # Em produção, logar a falha de comunicação com o gateway
-            return 
+            return
 
-        # 2. Buscar o pedido correspondente no repositório
-        pedido = self.pedido_repo.buscar_por_transacao_id(transacao_id)
-        
-        if not pedido:
-            # Logar que a transação não tem pedido correspondente (pode ser um erro do gateway)
+        if transacao is None:
+            # Gateway não conhece a transação; nada a fazer.
             return
-            
-        # 3. Mapear e atualizar o status
-        novo_status_pedido = self._STATUS_MAP.get(transacao.status_pagamento, pedido.status)
-
-        if pedido.status != novo_status_pedido:
-            pedido_final = self.pedido_repo.atualizar_status(
-                pedido.id, 
-                novo_status_pedido, 
-                id_externo_pagamento=transacao.referencia_externa
-            )
-            
-            # 4. Notificações
-            if novo_status_pedido == "PAGO":
-                try:
-                    self.email_service.enviar_aprovacao_pagamento(pedido_final)
-                except Exception:
-                    pass
-                
-                try:
-                    self.whatsapp_gateway.enviar_aprovacao_pagamento(pedido_final, pedido_final.telefone_whatsapp)
-                except Exception:
-                    pass
+
+        # 3. Mapear e atualizar o status. O Mercado Pago reenvia o mesmo
+        # webhook várias vezes por transação; quando o status mapeado já é
+        # o atual, o reenvio é um no-op — sai antes de qualquer escrita ou
+        # notificação. Essa comparação com o estado persistido é a
+        # deduplicação: vale entre processos/workers, sem memo à parte.
+        novo_status_pedido = _STATUS_TRANSACAO_PARA_PEDIDO.get(
+            transacao.status_pagamento, pedido.status
+        )
+        if pedido.status == novo_status_pedido:
+            return
+
+        pedido_final = self.pedido_repo.atualizar_status(
+            pedido.id,
+            novo_status_pedido,
+            id_externo_pagamento=transacao.referencia_externa
+        )
+
+        # 4. Notificações — mesmo padrão do checkout: com fila, só
+        # enfileira o ID; sem fila, os dois RTTs em paralelo no pool
+        # (falhas ficam nos Futures e não quebram o webhook).
+        if novo_status_pedido == "PAGO":
+            if self.task_queue is not None:
+                self.task_queue.enqueue_aprovacao(
+                    pedido_final.id, pedido_final.telefone_whatsapp
+                )
+                return
+            _despachar_notificacoes([
+                (self.email_service.enviar_aprovacao_pagamento, (pedido_final,)),
+                (
+                    self.whatsapp_gateway.enviar_aprovacao_pagamento,
+                    (pedido_final, pedido_final.telefone_whatsapp),
+                ),
+            ])
 
 
 class ListarPedidosDoUsuarioUseCase:
@@ -325,7 +435,7 @@ class ListarPedidosDoUsuarioUseCase:
     def __init__(self, pedido_repo: IPedidoRepository):
         self.pedido_repo = pedido_repo
         
-    def executar(self, usuario_id: str) -> List[Pedido]:
+    def executar(self, usuario_id: str) -> Iterable[Pedido]:
         """Retorna a lista de pedidos do usuário."""
         # A responsabilidade de listar por ID de usuário é do repositório
         return self.pedido_repo.listar_pedidos_por_usuario(usuario_id)
@@ -338,7 +448,9 @@ class ListarPedidosDoUsuarioUseCase:
 class GerenciarPedidosAdminUseCase:
     """Caso de Uso para listagem e atualização de pedidos (acesso administrativo)."""
     
-    STATUS_VALIDOS = ["PAGO", "PROCESSANDO", "ENVIADO", "ENTREGUE", "CANCELADO", "PENDENTE"]
+    # Alias de classe do frozenset de módulo (pertencimento O(1) com
+    # chaves internadas) — mantido como atributo público da classe.
+    STATUS_VALIDOS = _STATUS_VALIDOS
     
     def __init__(
         self, 
@@ -350,7 +462,7 @@ class GerenciarPedidosAdminUseCase:
         self.email_service = email_service
         self.whatsapp_gateway = whatsapp_gateway
         
-    def listar_todos(self, status: Optional[str] = None) -> List[Pedido]:
+    def listar_todos(self, status: Optional[str] = None) -> Iterable[Pedido]:
         """Lista todos os pedidos no sistema, com filtro opcional por status."""
         return self.pedido_repo.listar_todos_pedidos(status)
 
@@ -363,8 +475,12 @@ class GerenciarPedidosAdminUseCase:
 
     def atualizar_status_manual(self, pedido_id: str, novo_status: str) -> Pedido:
         """Atualiza o status de um pedido manualmente (ex: por um administrador)."""
-        novo_status_upper = novo_status.upper()
-        
+        # Formulários/admin já mandam o valor canônico em maiúsculas; só
+        # paga o .upper() (nova string) quando o valor não é canônico.
+        novo_status_upper = (
+            novo_status if novo_status in self.STATUS_VALIDOS else novo_status.upper()
+        )
+
         if novo_status_upper not in self.STATUS_VALIDOS:
             raise StatusInvalidoError(f"O status '{novo_status}' não é um status de pedido válido.")
         
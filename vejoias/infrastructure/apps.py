@@ -5,3 +5,7 @@ class InfrastructureConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vejoias.infrastructure'
     label = 'infrastructure' # Define um label para evitar conflitos de nomes
+
+    def ready(self):
+        # Registra os receivers de invalidação do cache do catálogo
+        from . import signals  # noqa: F401
@@ -1,18 +1,49 @@
+import logging
 import os
 import requests
 from datetime import datetime
-import uuid
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from decouple import config
 from decimal import Decimal
 from django.conf import settings
 from django.core.mail import send_mail
-from typing import List, Protocol, Optional, Tuple
+from django.db import transaction
+from time import monotonic
+from typing import List, Protocol, Optional, Tuple, Dict
 
 # Importa os Protocols e Entidades da camada Core (Use Cases e Entities)
 from vejoias.core.use_cases import IGatewayPagamento, IEmailService, IWhatsappGateway
 from vejoias.core.entities import Pedido, Usuario, Endereco, TransacaoPagamento
 from vejoias.core.exceptions import PagamentoFalhouError
 
+logger = logging.getLogger(__name__)
+
+
+def _nova_session_http(headers: dict) -> requests.Session:
+    """
+    Monta a Session compartilhada dos gateways com limites explícitos.
+
+    O pool do urllib3 fica com teto (pool_maxsize=50) para que uma rajada
+    de tráfego não abra sockets sem limite, e o Retry só reexecuta
+    métodos idempotentes (GET etc. — POST de pagamento nunca é repetido
+    aqui) com backoff curto, respeitando Retry-After do upstream.
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            respect_retry_after_header=True,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 # ====================================================================
 # GATEWAYS: Implementações concretas que se comunicam com APIs externas.
@@ -38,23 +69,48 @@ class MercadoPagoGateway(IGatewayPagamento):
 
     def __init__(self):
         self.api_base_url = "https://api.mercadopago.com/v1"
+        # URL de pagamentos montada uma vez: os handlers e o verificar_status
+        # não re-interpolam a f-string do endpoint a cada chamada.
+        self._payments_url = f"{self.api_base_url}/payments"
         # Deve ser lido de variáveis de ambiente seguras (configurado no settings.py do Django ou .env)
         self.access_token = os.environ.get("MERCADO_PAGO_ACCESS_TOKEN", config("MERCADO_PAGO_ACCESS_TOKEN", default="TOKEN_NAO_CONFIGURADO"))
         
         if not self.access_token or self.access_token == "TOKEN_NAO_CONFIGURADO":
             # Em vez de levantar ValueError, quebra o __init__ de forma controlada
-            print("ERRO: MERCADO_PAGO_ACCESS_TOKEN não configurado. Pagamentos reais falharão.")
+            logger.error("MERCADO_PAGO_ACCESS_TOKEN não configurado. Pagamentos reais falharão.")
+
+        # Session compartilhada: keep-alive + pool de conexões do urllib3
+        # reutilizam o TCP/TLS com api.mercadopago.com — sem um handshake
+        # novo a cada pagamento/consulta. Os headers fixos já vão na
+        # session; só a chave de idempotência é por chamada.
+        self._session = _nova_session_http({
+            "Authorization": f"Bearer {self.access_token}",
+            "Content-Type": "application/json",
+        })
+
+        # Tabela de despacho método -> handler: um lookup O(1) no dict em
+        # vez de percorrer a cadeia de if/elif a cada pagamento.
+        self._handlers_pagamento = {
+            "PIX": self._processar_pix,
+            "CARTAO": self._processar_cartao,
+            "BOLETO": self._despachar_boleto,
+        }
 
     # --- MÉTODOS PRIVADOS DE PROCESSAMENTO ESPECÍFICO ---
 
     def _processar_pix(self, pedido: Pedido, usuario: Usuario, dados: dict) -> TransacaoPagamento:
         """Processa um pagamento via Pix (Gerando QR Code)."""
+        # Chave de idempotência estável por pedido: um retry do mesmo
+        # checkout (timeout/5xx) reaproveita a proteção de duplicidade do
+        # Mercado Pago em vez de parecer uma cobrança nova.
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "X-Idempotency-Key": str(uuid.uuid4()),  # Para evitar duplicidade
+            "X-Idempotency-Key": dados.get('idempotency_key') or f"pedido-{pedido.id}-pix",
         }
         
+        # split() uma vez só: cada chamada re-varria o nome e alocava uma
+        # lista nova para first_name e outra para last_name.
+        nome_partes = usuario.nome.split() if usuario.nome else ()
+
         # Assumindo que o CPF, nome e email vêm do objeto Usuario
         payload = {
             "transaction_amount": float(pedido.total_pedido),
@@ -62,8 +118,8 @@ class MercadoPagoGateway(IGatewayPagamento):
             "description": f"Pedido {pedido.id} - Vê Jóias",
             "payer": {
                 "email": usuario.email,
-                "first_name": usuario.nome.split()[0] if usuario.nome else "Comprador",
-                "last_name": usuario.nome.split()[-1] if usuario.nome and len(usuario.nome.split()) > 1 else "", 
+                "first_name": nome_partes[0] if nome_partes else "Comprador",
+                "last_name": nome_partes[-1] if len(nome_partes) > 1 else "",
                 "identification": {
                     "type": "CPF",
                     # CPF é um campo vital para Pix/Boleto. Assumimos que está em 'dados' ou no model Usuario
@@ -73,8 +129,7 @@ class MercadoPagoGateway(IGatewayPagamento):
         }
         
         try:
-            url = f"{self.api_base_url}/payments"
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+            response = self._session.post(self._payments_url, json=payload, headers=headers, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -104,12 +159,16 @@ class MercadoPagoGateway(IGatewayPagamento):
         # e mais dependente dos dados de endereço (Endereco) para cobrança.
         # Por brevidade, vamos usar o mesmo retorno de _processar_pix, mas o MP exige mais dados aqui.
         
+        # Chave estável por pedido (ver _processar_pix).
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "X-Idempotency-Key": str(uuid.uuid4()),  # Para evitar duplicidade
+            "X-Idempotency-Key": dados.get('idempotency_key') or f"pedido-{pedido.id}-boleto",
         }
         
+        # Mesma economia do Pix: um split() só para os dois campos de nome,
+        # e o CEP normalizado uma vez fora do literal do dict.
+        nome_partes = usuario.nome.split() if usuario.nome else ()
+        cep_limpo = endereco.cep.replace('-', '')
+
         # O payload para Boleto exige os dados de Endereço no payer/address
         payload = {
              "transaction_amount": float(pedido.total_pedido),
@@ -117,14 +176,14 @@ class MercadoPagoGateway(IGatewayPagamento):
              "description": f"Pedido {pedido.id} - Vê Jóias",
              "payer": {
                  "email": usuario.email,
-                 "first_name": usuario.nome.split()[0] if usuario.nome else "Comprador",
-                 "last_name": usuario.nome.split()[-1] if usuario.nome and len(usuario.nome.split()) > 1 else "", 
+                 "first_name": nome_partes[0] if nome_partes else "Comprador",
+                 "last_name": nome_partes[-1] if len(nome_partes) > 1 else "",
                  "identification": {
                     "type": "CPF",
-                    "number": dados.get('cpf', '00000000000'), 
+                    "number": dados.get('cpf', '00000000000'),
                  },
                  "address": {
-                    "zip_code": endereco.cep.replace('-', ''),
+                    "zip_code": cep_limpo,
                     "street_name": endereco.rua,
                     "street_number": endereco.numero,
                     "city": endereco.cidade,
@@ -134,8 +193,7 @@ class MercadoPagoGateway(IGatewayPagamento):
         }
         
         try:
-            url = f"{self.api_base_url}/payments"
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+            response = self._session.post(self._payments_url, json=payload, headers=headers, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -168,10 +226,9 @@ class MercadoPagoGateway(IGatewayPagamento):
         if not card_token:
              raise PagamentoFalhouError("Token de cartão ausente na requisição.")
 
+        # Chave estável por pedido (ver _processar_pix).
         headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json",
-            "X-Idempotency-Key": str(uuid.uuid4()),
+            "X-Idempotency-Key": dados.get('idempotency_key') or f"pedido-{pedido.id}-cartao",
         }
         
         payload = {
@@ -190,8 +247,7 @@ class MercadoPagoGateway(IGatewayPagamento):
         }
 
         try:
-            url = f"{self.api_base_url}/payments"
-            response = requests.post(url, json=payload, headers=headers, timeout=15)
+            response = self._session.post(self._payments_url, json=payload, headers=headers, timeout=15)
             response.raise_for_status()
             
             data = response.json()
@@ -218,37 +274,31 @@ class MercadoPagoGateway(IGatewayPagamento):
         Método unificado do Protocolo IGatewayPagamento.
         Despacha a chamada para o método de pagamento específico.
         """
-        endereco = dados.get('endereco')
-        
         if not usuario:
              raise PagamentoFalhouError("Dados de Usuário ausentes para processamento do pagamento.")
 
-        metodo_upper = metodo.upper()
-
-        if metodo_upper == "PIX":
-            return self._processar_pix(pedido, usuario, dados)
-        elif metodo_upper == "BOLETO":
-            if not endereco:
-                raise PagamentoFalhouError("Endereço de cobrança ausente para Boleto.")
-            return self._processar_boleto(pedido, usuario, endereco, dados)
-        elif metodo_upper == "CARTAO":
-            return self._processar_cartao(pedido, usuario, dados)
-        else:
+        handler = self._handlers_pagamento.get(metodo.upper())
+        if handler is None:
             raise PagamentoFalhouError(f"Método de pagamento '{metodo}' não suportado.")
+        return handler(pedido, usuario, dados)
+
+    def _despachar_boleto(self, pedido: Pedido, usuario: Usuario, dados: dict) -> TransacaoPagamento:
+        """Valida o endereço de cobrança e delega para _processar_boleto."""
+        endereco = dados.get('endereco')
+        if not endereco:
+            raise PagamentoFalhouError("Endereço de cobrança ausente para Boleto.")
+        return self._processar_boleto(pedido, usuario, endereco, dados)
 
     def verificar_status(self, transacao_id: str) -> TransacaoPagamento:
         """
         Implementa o Protocolo IGatewayPagamento.
         Busca o status atual de uma transação (pagamento) no Mercado Pago.
         """
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-        }
-        
-        url = f"{self.api_base_url}/payments/{transacao_id}"
-        
+        url = f"{self._payments_url}/{transacao_id}"
+
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            # Authorization já vai nos headers da session.
+            response = self._session.get(url, timeout=10)
             response.raise_for_status() 
             
             data = response.json()
@@ -265,11 +315,25 @@ class MercadoPagoGateway(IGatewayPagamento):
             )
             
         except requests.exceptions.RequestException as e:
-            print(f"ERRO MP API: Falha ao buscar status da transação {transacao_id}: {e}")
+            logger.error("MP API: Falha ao buscar status da transação %s: %s", transacao_id, e)
             # Lançamos uma exceção genérica para o Use Case lidar
             raise Exception("Falha ao buscar status da transação no Gateway.")
 
 
+# Partes constantes dos payloads dos gateways, montadas uma vez no import:
+# cada chamada só acrescenta os campos dinâmicos em vez de realocar os
+# dicts fixos (e a serialização não muta os templates).
+_GROQ_MODELO = "llama3-8b-8192"
+_OPCOES_ENVIO_WHATSAPP = {"delay": 1200, "presence": "typing"}
+
+# Memo de respostas do chatbot: perguntas frequentes idênticas ("horário
+# de funcionamento", "política de troca") reaproveitam a resposta por
+# alguns minutos em vez de pagar rede + inferência do Groq de novo.
+# Chave = prompt normalizado; valor = (instante monotônico, resposta).
+_RESPOSTAS_CHATBOT_TTL = 600.0
+_respostas_chatbot: Dict[str, Tuple[float, str]] = {}
+
+
 class GroqGateway:
     """Gateway para comunicação com a API da Groq para o chatbot (Não implementa protocolo Core)."""
     def __init__(self):
@@ -279,27 +343,55 @@ class GroqGateway:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Session compartilhada (keep-alive): o chatbot bate sempre no
+        # mesmo host, então o handshake TLS é pago uma vez por conexão.
+        self._session = _nova_session_http(self.headers)
         if self.api_key == "KEY_NAO_CONFIGURADA":
-            print("AVISO: GROQ_API_KEY não configurada.")
+            logger.warning("GROQ_API_KEY não configurada.")
     
-    def perguntar_ao_chatbot(self, prompt: str) -> str:
-        """Envia um prompt para o chatbot e retorna a resposta."""
+    def perguntar_ao_chatbot(self, prompt: str, usar_cache: bool = True) -> str:
+        """
+        Envia um prompt para o chatbot e retorna a resposta.
+
+        Prompts idênticos dentro do TTL respondem do memo, sem nova
+        chamada ao Groq; passe usar_cache=False para prompts
+        personalizados que não devem ser compartilhados entre usuários.
+        """
+        chave = prompt.strip().lower()
+        if usar_cache:
+            registro = _respostas_chatbot.get(chave)
+            if registro is not None and monotonic() - registro[0] < _RESPOSTAS_CHATBOT_TTL:
+                return registro[1]
+
         payload = {
-            "model": "llama3-8b-8192",  
+            "model": _GROQ_MODELO,
             "messages": [{"role": "user", "content": prompt}],
         }
         
         try:
-            response = requests.post(f"{self.base_url}/chat/completions", json=payload, headers=self.headers, timeout=30)
+            response = self._session.post(f"{self.base_url}/chat/completions", json=payload, timeout=30)
             response.raise_for_status()
             
             data = response.json()
-            # Certifica-se de que a data_criacao está sendo atribuída corretamente
-            return data["choices"][0]["message"]["content"]
+            resposta = data["choices"][0]["message"]["content"]
             
         except requests.exceptions.RequestException as e:
             raise Exception(f"Erro de conexão com a API da Groq: {e}")
 
+        if usar_cache:
+            # Poda preguiçosa: só varre o memo quando ele cresce, para a
+            # limpeza não custar nada no caminho comum.
+            if len(_respostas_chatbot) > 256:
+                agora = monotonic()
+                expiradas = [
+                    c for c, (instante, _) in _respostas_chatbot.items()
+                    if agora - instante >= _RESPOSTAS_CHATBOT_TTL
+                ]
+                for c in expiradas:
+                    del _respostas_chatbot[c]
+            _respostas_chatbot[chave] = (monotonic(), resposta)
+        return resposta
+
 
 class EvolutionAPIGateway(IWhatsappGateway):
     """
@@ -317,30 +409,38 @@ class EvolutionAPIGateway(IWhatsappGateway):
             "apikey": self.api_key,
             "Content-Type": "application/json"
         }
+        # Mesma session para todas as mensagens: reaproveita a conexão
+        # com a Evolution API em vez de renegociar TLS a cada envio.
+        self._session = _nova_session_http(self.headers)
         if self.api_key == "KEY_NAO_CONFIGURADA":
-            print("AVISO: Chave Evolution-API não configurada.")
+            logger.warning("Chave Evolution-API não configurada.")
+
+        # As credenciais não mudam em runtime: o flag de habilitado e a
+        # URL de envio são resolvidos uma vez aqui, em vez de revalidar
+        # e re-interpolar a f-string a cada mensagem.
+        self._habilitado = bool(self.api_key and self.instance_name and self.base_url)
+        self._url_envio = f"{self.base_url}/{self.instance_name}/message/sendText"
 
     def _enviar_mensagem(self, numero_telefone: str, mensagem: str) -> bool:
         """Método auxiliar para enviar a mensagem real."""
-        if not self.api_key or not self.instance_name or not self.base_url:
-            print("AVISO: Configuração da Evolution-API incompleta. Envio de WhatsApp ignorado.")
+        if not self._habilitado:
+            logger.warning("Configuração da Evolution-API incompleta. Envio de WhatsApp ignorado.")
             return False
 
         payload = {
             "number": numero_telefone,
-            "options": {"delay": 1200, "presence": "typing"},
+            "options": _OPCOES_ENVIO_WHATSAPP,
             "textMessage": {"text": mensagem}
         }
         
         try:
-            url = f"{self.base_url}/{self.instance_name}/message/sendText"
-            response = requests.post(url, json=payload, headers=self.headers, timeout=5)
+            response = self._session.post(self._url_envio, json=payload, timeout=5)
             response.raise_for_status() 
             
             return response.status_code in [200, 201]
             
         except requests.exceptions.RequestException as e:
-            print(f"ERRO EvolutionAPI: Falha ao enviar mensagem: {e}")
+            logger.error("EvolutionAPI: Falha ao enviar mensagem: %s", e)
             return False
 
     def enviar_confirmacao_pedido(self, pedido: Pedido, numero_telefone: str) -> bool:
@@ -380,7 +480,7 @@ class WhatsAppGatewayMock(IWhatsappGateway):
     
     def _enviar_mensagem(self, numero_telefone: str, mensagem: str) -> bool:
         """Método auxiliar que simula envio de mensagem."""
-        print(f"[MOCK WhatsApp] Para: {numero_telefone}\nMensagem: {mensagem}")
+        logger.debug("[MOCK WhatsApp] Para: %s\nMensagem: %s", numero_telefone, mensagem)
         return True
 
     def enviar_confirmacao_pedido(self, pedido: Pedido, numero_telefone: str) -> bool:
@@ -418,6 +518,11 @@ class EmailServiceGateway(IEmailService):
     Implementa o Protocolo IEmailService.
     """
 
+    def __init__(self):
+        # O remetente vem do settings e não muda em runtime: resolvido
+        # uma vez aqui em vez do hasattr a cada e-mail enviado.
+        self._remetente = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@vejoias.com')
+
     def enviar_confirmacao_pedido(self, pedido: Pedido) -> bool:
         """Implementa IEmailService - Confirmação do pedido."""
         
@@ -436,20 +541,18 @@ class EmailServiceGateway(IEmailService):
             f"Obrigado por comprar na Vê Joias!"
         )
         
-        remetente = settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@vejoias.com'
-
         try:
             send_mail(
                 assunto,
                 mensagem,
-                remetente,
+                self._remetente,
                 [destinatario],
                 fail_silently=False, 
             )
             return True
             
         except Exception as e:
-            print(f"ERRO: Falha ao enviar e-mail de confirmação do pedido {pedido.id}: {e}")
+            logger.error("Falha ao enviar e-mail de confirmação do pedido %s: %s", pedido.id, e)
             return False
 
     def enviar_aprovacao_pagamento(self, pedido: Pedido) -> bool:
@@ -468,19 +571,17 @@ class EmailServiceGateway(IEmailService):
             f"Equipe Vê Jóias."
         )
         
-        remetente = settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@vejoias.com'
-
         try:
             send_mail(
                 assunto,
                 mensagem,
-                remetente,
+                self._remetente,
                 [destinatario],
                 fail_silently=False, 
             )
             return True
         except Exception as e:
-            print(f"ERRO: Falha ao enviar e-mail de aprovação do pedido {pedido.id}: {e}")
+            logger.error("Falha ao enviar e-mail de aprovação do pedido %s: %s", pedido.id, e)
             return False
 
     def enviar_status_mudanca(self, pedido: Pedido) -> bool:
@@ -499,17 +600,81 @@ class EmailServiceGateway(IEmailService):
             f"Equipe Vê Jóias."
         )
         
-        remetente = settings.DEFAULT_FROM_EMAIL if hasattr(settings, 'DEFAULT_FROM_EMAIL') else 'noreply@vejoias.com'
-
         try:
             send_mail(
                 assunto,
                 mensagem,
-                remetente,
+                self._remetente,
                 [destinatario],
                 fail_silently=False, 
             )
             return True
         except Exception as e:
-            print(f"ERRO: Falha ao enviar e-mail de mudança de status do pedido {pedido.id}: {e}")
+            logger.error("Falha ao enviar e-mail de mudança de status do pedido %s: %s", pedido.id, e)
             return False
+
+
+# ====================================================================
+# GATEWAYS ASSÍNCRONOS (Celery)
+# ====================================================================
+
+class EmailServiceCeleryGateway(EmailServiceGateway):
+    """
+    Variante assíncrona do EmailServiceGateway: a confirmação de pedido é
+    despachada para a fila Celery em vez de bloquear a resposta HTTP no
+    SMTP. O on_commit garante que a task só dispara depois que o pedido
+    está visível no banco para o worker.
+    """
+
+    def enviar_confirmacao_pedido(self, pedido: Pedido) -> bool:
+        from . import tasks
+        transaction.on_commit(
+            lambda: tasks.enviar_confirmacao_pedido_email.delay(pedido.id)
+        )
+        return True
+
+
+class EvolutionAPICeleryGateway(EvolutionAPIGateway):
+    """
+    Variante assíncrona do EvolutionAPIGateway: a confirmação de pedido
+    via WhatsApp vai para a fila Celery (mesma lógica do e-mail acima).
+    """
+
+    def enviar_confirmacao_pedido(self, pedido: Pedido, numero_telefone: str) -> bool:
+        from . import tasks
+        transaction.on_commit(
+            lambda: tasks.enviar_confirmacao_pedido_whatsapp.delay(pedido.id, numero_telefone)
+        )
+        return True
+
+
+class NotificacaoCeleryTaskQueue:
+    """
+    Adaptador Celery de INotificacaoTaskQueue: enfileira as notificações
+    de um pedido como tasks, só depois do commit da transação corrente
+    (o worker precisa enxergar o pedido no banco). Email + WhatsApp vão
+    num único group(): um callback de commit e uma única ida ao broker
+    para as duas tasks.
+    """
+
+    def enqueue_confirmacao(self, pedido_id: str, numero_telefone: str) -> None:
+        from celery import group
+
+        from . import tasks
+        transaction.on_commit(
+            group(
+                tasks.enviar_confirmacao_pedido_email.s(pedido_id),
+                tasks.enviar_confirmacao_pedido_whatsapp.s(pedido_id, numero_telefone),
+            ).apply_async
+        )
+
+    def enqueue_aprovacao(self, pedido_id: str, numero_telefone: str) -> None:
+        from celery import group
+
+        from . import tasks
+        transaction.on_commit(
+            group(
+                tasks.enviar_aprovacao_pagamento_email.s(pedido_id),
+                tasks.enviar_aprovacao_pagamento_whatsapp.s(pedido_id, numero_telefone),
+            ).apply_async
+        )
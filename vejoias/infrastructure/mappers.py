@@ -4,6 +4,7 @@ Mapeadores (Mappers) para converter entre:
 2. Entidades de Domínio (vejoias.core.entities)
 """
 from typing import Any, Optional, TypeVar, Type, List, Dict
+from django.core.cache import cache
 from django.db import models
 from django.apps import apps
 
@@ -82,6 +83,26 @@ class BaseMapper:
         return entity_class(**entity_data)
 
 
+# TTL um pouco abaixo da expiração típica de URL assinada (3600s), para a
+# URL nunca sair do cache já vencida.
+_URL_IMAGEM_TTL = 3300
+
+
+def _url_imagem(campo, versao=None) -> Optional[str]:
+    """
+    Resolve campo.url com cache no Redis.
+
+    Em storages remotos (S3/MinIO) cada acesso a .url gera uma URL assinada
+    (HMAC-SHA256 sobre caminho + expiração) — custo de CPU por linha da
+    listagem. A chave inclui a versão (data de atualização) para invalidar
+    quando a imagem muda; no storage local o cache só poupa o join de path.
+    """
+    if not campo:
+        return None
+    key = f'img:{campo.name}:{versao or ""}'
+    return cache.get_or_set(key, lambda: campo.url, _URL_IMAGEM_TTL)
+
+
 # ====================================================================
 # MAPERS DO CATÁLOGO
 # ====================================================================
@@ -101,7 +122,7 @@ class CategoriaMapper(BaseMapper):
             id=model.id,
             nome=model.nome,
             slug=model.slug,
-            imagem=model.imagem.url if model.imagem else None,
+            imagem=_url_imagem(model.imagem),
             descricao=model.descricao,
             em_destaque=model.em_destaque
         )
@@ -143,7 +164,31 @@ class JoiaMapper(BaseMapper):
             estoque=model.estoque,
             desconto=model.desconto,
             em_destaque=model.em_destaque,
-            imagem_principal=model.imagem_principal.url if model.imagem_principal else None,
+            imagem_principal=_url_imagem(model.imagem_principal, model.data_atualizacao),
+            categoria=CategoriaMapper.to_entity(model.categoria) if model.categoria else None
+        )
+
+    @staticmethod
+    def to_entity_listagem(model: Any) -> Optional[JoiaEntity]:
+        """
+        Converte Joia Model para Joia Entity sem tocar em `descricao`.
+
+        Usado pela listagem do catálogo, que consulta com .only() e não
+        carrega o TEXT de descrição; acessar model.descricao aqui dispararia
+        uma query extra por linha (deferred load).
+        """
+        if not model: return None
+        return JoiaEntity(
+            id=model.id,
+            nome=model.nome,
+            slug=model.slug,
+            descricao='',
+            preco=model.preco,
+            estoque=model.estoque,
+            categoria_id=model.categoria_id,
+            desconto=model.desconto,
+            em_destaque=model.em_destaque,
+            imagem_principal=_url_imagem(model.imagem_principal, model.data_atualizacao),
             categoria=CategoriaMapper.to_entity(model.categoria) if model.categoria else None
         )
 
@@ -176,22 +221,18 @@ class UsuarioMapper(BaseMapper):
 
     @classmethod
     def model_class(cls) -> Type[models.Model]:
-        return get_model('core', 'Usuario')
+        return get_model('infrastructure', 'Usuario')
 
     @staticmethod
     def to_entity(model: Any) -> Optional[UsuarioEntity]:
         """Converte Usuario Model para Usuario Entity."""
         if not model: return None
+        # A entidade só carrega o que os casos de uso consomem (nome para
+        # o snapshot de entrega, email para notificações).
         return UsuarioEntity(
             id=model.id,
+            nome=model.get_full_name() or model.email,
             email=model.email,
-            first_name=model.first_name,
-            last_name=model.last_name,
-            telefone=model.telefone,
-            cpf=model.cpf,
-            is_active=model.is_active,
-            is_staff=model.is_staff,
-            is_superuser=model.is_superuser
         )
 
 class EnderecoMapper(BaseMapper):
@@ -321,30 +362,61 @@ class ItemPedidoMapper(BaseMapper):
         """Converte ItemPedido Model para ItemPedido Entity."""
         if not model: return None
         return ItemPedidoEntity(
-            id=model.id,
-            joia_nome=model.joia_nome,
-            joia_preco=model.joia_preco,
+            pedido_id=model.pedido_id,
+            joia_id=model.joia_id,
+            nome_produto=model.nome_produto,
+            preco_unitario=model.preco_unitario,
             quantidade=model.quantidade,
-            subtotal=model.subtotal,
-            pedido_id=model.pedido_id
         )
-        
-    @staticmethod
+
     @classmethod
     def to_model(cls, entity: ItemPedidoEntity, pedido_id: int, model: Optional[Any] = None) -> Any:
         """Converte ItemPedido Entity para ItemPedido Model."""
         if not model:
             model = cls.model_class()(pedido_id=pedido_id)
-            
-        # Snapshot dos dados, não dependem de FK para Joia
-        model.joia_nome = entity.joia_nome
-        model.joia_preco = entity.joia_preco
+
+        # Snapshot dos dados no momento da compra
+        model.joia_id = entity.joia_id
+        model.nome_produto = entity.nome_produto
+        model.preco_unitario = entity.preco_unitario
         model.quantidade = entity.quantidade
+        # bulk_create não passa pelo save() do model, então o subtotal é
+        # materializado aqui.
         model.subtotal = entity.subtotal
-        
+
         return model
 
 
+# Flyweight (Identity Map) de endereços hidratados: a maioria dos usuários
+# repete 1-2 endereços de entrega, então pedidos que compartilham o mesmo
+# snapshot passam a compartilhar uma única instância de EnderecoEntity em
+# vez de alocar uma por pedido nas listagens. O teto evita que o dict
+# cresça para sempre num worker de vida longa; estourou, esvazia — é só
+# dedup de memória, perder o cache apenas realoca instâncias.
+_ENDERECO_CACHE: Dict[tuple, EnderecoEntity] = {}
+_ENDERECO_CACHE_MAX = 2048
+
+
+def _endereco_from_snapshot(model: Any) -> EnderecoEntity:
+    """Hidrata o snapshot de endereço de um Pedido, deduplicando via cache."""
+    row = (
+        model.usuario_id,
+        model.rua_entrega,
+        model.numero_entrega,
+        model.cidade_entrega,
+        model.estado_entrega,
+        model.cep_entrega,
+        None,  # id: snapshot não referencia um Endereco persistido
+        model.complemento_entrega,
+    )
+    endereco = _ENDERECO_CACHE.get(row)
+    if endereco is None:
+        if len(_ENDERECO_CACHE) >= _ENDERECO_CACHE_MAX:
+            _ENDERECO_CACHE.clear()
+        endereco = _ENDERECO_CACHE[row] = EnderecoEntity(*row)
+    return endereco
+
+
 class PedidoMapper(BaseMapper):
     """Mapeador para Pedido."""
 
@@ -355,59 +427,52 @@ class PedidoMapper(BaseMapper):
     def to_entity(model: Any) -> Optional[PedidoEntity]:
         """Converte Pedido Model para Pedido Entity, incluindo endereço snapshot."""
         if not model: return None
-        
-        # Mapeia o snapshot de endereço para a Entidade EnderecoEntity
-        endereco_entity = EnderecoEntity(
-            # Campos do EnderecoEntity que são opcionais podem ser omitidos
-            id=None,
-            principal=False,
-            # Campos mapeados do snapshot do Pedido
-            cep=model.cep_entrega,
-            rua=model.rua_entrega,
-            numero=model.numero_entrega,
-            bairro=model.bairro_entrega,
-            cidade=model.cidade_entrega,
-            estado=model.estado_entrega,
-            referencia=model.referencia_entrega
-        )
+
+        # Snapshot de endereço deduplicado (Entidade imutável compartilhada)
+        endereco_entity = _endereco_from_snapshot(model)
         
         # Mapeia os itens do pedido
         itens_entity = [ItemPedidoMapper.to_entity(item) for item in model.itens.all()]
         
         return PedidoEntity(
-            id=model.id,
-            usuario_id=model.usuario_id,
-            data_pedido=model.data_pedido,
+            usuario=UsuarioMapper.to_entity(model.usuario),
+            itens=itens_entity,
             status=model.status,
-            total_pedido=model.total_pedido,
-            tipo_pagamento=model.tipo_pagamento,
+            total=model.total,
+            tipo_pagamento=model.forma_pagamento,
             endereco_entrega=endereco_entity,
-            telefone_whatsapp=model.telefone_whatsapp,
-            itens=itens_entity
-            # Transacao não está mapeada aqui, pois seria carregada por outro serviço/mapper
+            telefone_whatsapp=model.telefone_contato,
+            transacao_id=model.codigo_transacao,
+            data_pedido=model.data_pedido,
+            id=model.id,
+            data_modificacao=model.data_modificacao,
         )
-        
-    @staticmethod
+
     @classmethod
     def to_model(cls, entity: PedidoEntity, model: Optional[Any] = None) -> Any:
         """Converte Pedido Entity para Pedido Model."""
         if not model:
-            model = cls.model_class()(usuario_id=entity.usuario_id)
-            
+            model = cls.model_class()(usuario_id=entity.usuario.id)
+
         model.status = entity.status
-        model.total_pedido = entity.total_pedido
-        model.tipo_pagamento = entity.tipo_pagamento
-        model.telefone_whatsapp = entity.telefone_whatsapp
-        
-        # Mapeia a Entidade Endereco para os campos snapshot do Model
-        model.cep_entrega = entity.endereco_entrega.cep
-        model.rua_entrega = entity.endereco_entrega.rua
-        model.numero_entrega = entity.endereco_entrega.numero
-        model.bairro_entrega = entity.endereco_entrega.bairro
-        model.cidade_entrega = entity.endereco_entrega.cidade
-        model.estado_entrega = entity.endereco_entrega.estado
-        model.referencia_entrega = entity.endereco_entrega.referencia
-        
+        model.total = entity.total
+        model.forma_pagamento = entity.tipo_pagamento
+        model.codigo_transacao = entity.transacao_id
+        model.telefone_contato = entity.telefone_whatsapp
+        model.email_contato = entity.usuario.email
+
+        # Mapeia a Entidade Endereco para os campos snapshot do Model.
+        # A entidade não carrega bairro; o campo do model fica com o
+        # default do CharField.
+        endereco = entity.endereco_entrega
+        model.nome_entrega = entity.usuario.nome
+        model.cep_entrega = endereco.cep
+        model.rua_entrega = endereco.rua
+        model.numero_entrega = endereco.numero
+        model.complemento_entrega = endereco.complemento
+        model.cidade_entrega = endereco.cidade
+        model.estado_entrega = endereco.estado
+
         return model
 
 
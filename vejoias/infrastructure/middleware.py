@@ -0,0 +1,41 @@
+"""
+Camada de Infraestrutura: Middlewares.
+
+RequestCacheMiddleware abre memos por request para lookups repetidos de
+pedido e de joia (página de detalhe + checagens de permissão + contexto
+do carrinho batem nos mesmos buscar_por_id várias vezes no mesmo ciclo).
+O ContextVar isola os memos por request mesmo sob servidores
+assíncronos/threads, e o escopo curto evita o problema de staleness de
+um cache compartilhado.
+"""
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+_pedido_cache: ContextVar[Optional[Dict]] = ContextVar('pedido_cache', default=None)
+_joia_cache: ContextVar[Optional[Dict]] = ContextVar('joia_cache', default=None)
+
+
+def obter_pedido_cache() -> Optional[Dict]:
+    """Memo de pedidos do request atual, ou None fora de um request."""
+    return _pedido_cache.get()
+
+
+def obter_joia_cache() -> Optional[Dict]:
+    """Memo de joias do request atual, ou None fora de um request."""
+    return _joia_cache.get()
+
+
+class RequestCacheMiddleware:
+    """Cria e descarta os memos por request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token_pedido = _pedido_cache.set({})
+        token_joia = _joia_cache.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _joia_cache.reset(token_joia)
+            _pedido_cache.reset(token_pedido)
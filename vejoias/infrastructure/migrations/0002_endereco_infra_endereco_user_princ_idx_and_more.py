@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-29 08:49
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('infrastructure', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='endereco',
+            index=models.Index(fields=['usuario', '-is_principal'], name='infra_endereco_user_princ_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usuario',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='infra_usuario_email_lower_idx'),
+        ),
+    ]
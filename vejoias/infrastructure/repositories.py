@@ -4,11 +4,14 @@ Camada de Infraestrutura: Implementação de Repositórios e Gateways.
 Esta camada traduz as operações abstratas definidas nas Interfaces da Core
 em chamadas concretas ao framework (Django ORM, APIs externas, etc.).
 """
-from typing import List, Optional
+import logging
+from typing import Iterable, List, Optional
 from typing import Dict
 import uuid
 from datetime import datetime
-from django.db.models import Q, F, Sum, Prefetch
+from django.contrib.postgres.search import TrigramSimilarity
+from django.core.cache import cache
+from django.db.models import Q, F, Sum, Prefetch, Case, When, IntegerField
 from django.db import transaction
 from django.db.utils import IntegrityError
 from decimal import Decimal
@@ -42,9 +45,12 @@ from .mappers import (
     JoiaMapper, EnderecoMapper, ItemCarrinhoMapper, CarrinhoMapper,
     ItemPedidoMapper, PedidoMapper, UsuarioMapper, CategoriaMapper, SubcategoriaMapper
 )
+from .middleware import obter_joia_cache, obter_pedido_cache
 
 User = get_user_model()
 
+logger = logging.getLogger(__name__)
+
 
 # ====================================================================
 # 1. REPOSITÓRIOS (Implementação Django ORM)
@@ -56,9 +62,60 @@ def get_model(app_label, model_name):
     return apps.get_model(app_label, model_name)
 
 
+# Chaves do cache Redis de leitura do catálogo. Joias e categorias mudam
+# raramente, mas são lidas em toda página de produto e render do menu —
+# um GET no Redis (~0.1 ms) substitui o SELECT + desserialização de linha.
+# A invalidação fica em infrastructure/signals.py (post_save/post_delete).
+JOIA_CACHE_KEY = 'joia:%s'
+CATEGORIAS_DESTAQUE_CACHE_KEY = 'categorias:destaque:v1'
+# Chave versionada da listagem: as combinações (busca, slug, página) são
+# arbitrárias demais para deletar uma a uma — escritas no catálogo só
+# incrementam a versão e as chaves antigas expiram pelo TTL.
+CATALOGO_VERSAO_CACHE_KEY = 'catalogo:versao'
+JOIA_LISTAGEM_CACHE_KEY = 'joias:listagem:v%s:%s:%s:%s:%s:%s:%s'
+_CATALOGO_CACHE_TIMEOUT = 3600  # 1 hora; escritas invalidam antes
+
+# Histórico de pedidos por usuário ("Meus Pedidos"): lista pequena e
+# relida com frequência. Escritas no pedido derrubam a chave do dono.
+PEDIDOS_USUARIO_CACHE_KEY = 'pedidos:usuario:%s'
+_PEDIDOS_USUARIO_CACHE_TIMEOUT = 300  # 5 minutos
+
+
+def _versao_catalogo():
+    """Versão corrente da listagem do catálogo (criada sob demanda)."""
+    versao = cache.get(CATALOGO_VERSAO_CACHE_KEY)
+    if versao is None:
+        cache.add(CATALOGO_VERSAO_CACHE_KEY, 1, None)
+        versao = cache.get(CATALOGO_VERSAO_CACHE_KEY, 1)
+    return versao
+
+
+def invalidar_listagem_catalogo():
+    """Incrementa a versão da listagem; chamado pelos signals de escrita."""
+    try:
+        cache.incr(CATALOGO_VERSAO_CACHE_KEY)
+    except ValueError:
+        # Chave ainda não existe (cache frio/flush): nada a invalidar.
+        pass
+
+
+# Campos realmente lidos pelo mapeamento de listagem (JoiaMapper.to_entity_listagem)
+_JOIA_LISTAGEM_ONLY = (
+    'id', 'nome', 'slug', 'preco', 'estoque', 'desconto',
+    'em_destaque', 'imagem_principal', 'data_atualizacao', 'categoria_id',
+    'categoria__id', 'categoria__nome', 'categoria__slug',
+    'categoria__imagem', 'categoria__descricao', 'categoria__em_destaque',
+)
+
+
 class JoiaRepositoryDjango(IJoiaRepository):
     """Implementação do JoiaRepository usando o Django ORM."""
 
+    # QuerySets base da listagem, montados uma única vez (QuerySets são
+    # imutáveis/lazy; .all() devolve um clone barato por requisição).
+    _qs_listagem_base = None
+    _qs_listagem_em_estoque = None
+
     # Propriedades para carregar modelos de forma LAZY
     @property
     def JoiaModel(self):
@@ -73,34 +130,140 @@ class JoiaRepositoryDjango(IJoiaRepository):
         return get_model('catalog', 'Subcategoria')
 
     def buscar_por_id(self, id: int) -> Optional[Joia]:
+        # Memo por request (mesmo padrão do memo de pedidos): a mesma joia
+        # é consultada várias vezes num ciclo (detalhe + contexto do
+        # carrinho + validações) — só a primeira paga o Redis/banco.
+        memo = obter_joia_cache()
+        if memo is not None and id in memo:
+            return memo[id]
+
+        cache_key = JOIA_CACHE_KEY % id
+        entity = cache.get(cache_key)
+        if entity is not None:
+            if memo is not None:
+                memo[id] = entity
+            return entity
+
         try:
             # Usa self.JoiaModel
             model = self.JoiaModel.objects.select_related('categoria', 'subcategoria').get(pk=id)
-            return JoiaMapper.to_entity(model)
         except self.JoiaModel.DoesNotExist:
+            if memo is not None:
+                memo[id] = None
             return None
 
+        entity = JoiaMapper.to_entity(model)
+        cache.set(cache_key, entity, _CATALOGO_CACHE_TIMEOUT)
+        if memo is not None:
+            memo[id] = entity
+        return entity
+
+    @staticmethod
+    def _invalidar_memo_joia(joia_id):
+        """Tira a joia do memo do request após uma escrita no mesmo ciclo."""
+        memo = obter_joia_cache()
+        if memo is not None:
+            memo.pop(joia_id, None)
+
+    def buscar_por_ids(self, joia_ids: List[str]) -> Dict[str, Joia]:
+        """
+        Busca várias joias num único SELECT ... WHERE id IN (...).
+
+        Usado no checkout para validar estoque de todos os itens de uma vez,
+        em vez de uma query por item do carrinho.
+        """
+        models = self.JoiaModel.objects.select_related('categoria', 'subcategoria').filter(
+            pk__in=joia_ids
+        )
+        return {model.id: JoiaMapper.to_entity(model) for model in models}
+
     def buscar_por_criterios(
-        self, 
-        em_estoque: bool, 
-        busca: Optional[str] = None, 
-        categoria_slug: Optional[str] = None
+        self,
+        em_estoque: bool = True,
+        busca: Optional[str] = None,
+        categoria_slug: Optional[str] = None,
+        limite: Optional[int] = None,
+        offset: int = 0,
+        em_destaque: bool = False
     ) -> List[Joia]:
-        
-        qs = self.JoiaModel.objects.all().select_related('categoria', 'subcategoria')
-        
+
+        # O catálogo muda raramente; a lista mapeada fica no cache sob
+        # chave versionada por (busca, categoria_slug, página) — hit evita
+        # o round-trip ao banco e o mapeamento por linha.
+        cache_key = JOIA_LISTAGEM_CACHE_KEY % (
+            _versao_catalogo(), int(em_estoque), busca or '', categoria_slug or '',
+            limite if limite is not None else '', offset or '', int(em_destaque)
+        )
+        entities = cache.get(cache_key)
+        if entities is not None:
+            return entities
+
+        # Caminho rápido: a listagem sem filtros (home/catálogo) é o caso
+        # mais comum — usa o QuerySet pré-montado sem reconstruir a cadeia
+        # select_related/only nem objetos Q.
+        if em_estoque and not busca and not categoria_slug and not em_destaque:
+            qs = self._listagem_em_estoque_qs()
+            if limite is not None:
+                # Fatia no SQL (LIMIT/OFFSET): só a página pedida é lida e mapeada.
+                qs = qs[offset:offset + limite]
+            entities = [JoiaMapper.to_entity_listagem(model) for model in qs]
+            cache.set(cache_key, entities, _CATALOGO_CACHE_TIMEOUT)
+            return entities
+
+        qs = self._listagem_base_qs()
+
         if em_estoque:
             qs = qs.filter(estoque__gt=0)
 
         if busca:
-            # Busca por nome ou descrição
-            qs = qs.filter(Q(nome__icontains=busca) | Q(descricao__icontains=busca))
-            
+            # Busca por nome ou descrição. Os índices GIN pg_trgm de
+            # catalogo_joia atendem o ILIKE '%busca%' (sem seq scan); o
+            # ranking por similaridade de trigrama põe os melhores
+            # resultados primeiro.
+            qs = qs.filter(
+                Q(nome__icontains=busca) | Q(descricao__icontains=busca)
+            ).annotate(
+                similaridade=TrigramSimilarity('nome', busca)
+            ).order_by('-similaridade')
+
         if categoria_slug:
             # Acessa o modelo de categoria via propriedade
             qs = qs.filter(categoria__slug=categoria_slug)
-            
-        return [JoiaMapper.to_entity(model) for model in qs]
+
+        if em_destaque:
+            qs = qs.filter(em_destaque=True)
+
+        if limite is not None:
+            # Fatia no SQL (LIMIT/OFFSET): só a página pedida é lida e mapeada.
+            qs = qs[offset:offset + limite]
+
+        entities = [JoiaMapper.to_entity_listagem(model) for model in qs]
+        cache.set(cache_key, entities, _CATALOGO_CACHE_TIMEOUT)
+        return entities
+
+    def _listagem_base_qs(self):
+        """
+        QuerySet base da listagem: .only() corta o TEXT de descrição (e os
+        campos não mapeados) dos bytes trafegados. O mapeamento usa
+        to_entity_listagem, que não acessa `descricao`.
+        """
+        qs = JoiaRepositoryDjango._qs_listagem_base
+        if qs is None:
+            qs = JoiaRepositoryDjango._qs_listagem_base = (
+                self.JoiaModel.objects.select_related('categoria').only(*_JOIA_LISTAGEM_ONLY)
+            )
+        # .all() clona: o template de classe nunca é avaliado, então nenhum
+        # _result_cache antigo vaza entre requests.
+        return qs.all()
+
+    def _listagem_em_estoque_qs(self):
+        """Variante já filtrada por estoque, para o caminho sem parâmetros."""
+        qs = JoiaRepositoryDjango._qs_listagem_em_estoque
+        if qs is None:
+            qs = JoiaRepositoryDjango._qs_listagem_em_estoque = (
+                self._listagem_base_qs().filter(estoque__gt=0)
+            )
+        return qs.all()
     
     def contar_total(self) -> int:
         """
@@ -121,6 +284,7 @@ class JoiaRepositoryDjango(IJoiaRepository):
                 
         model = JoiaMapper.to_model(joia, model)
         model.save()
+        self._invalidar_memo_joia(model.pk)
         return JoiaMapper.to_entity(model)
 
     def atualizar_estoque(self, joia_id: str, quantidade: int) -> None:
@@ -132,6 +296,7 @@ class JoiaRepositoryDjango(IJoiaRepository):
             if joia.estoque >= quantidade:
                 joia.estoque -= quantidade
                 joia.save()
+                self._invalidar_memo_joia(joia_id)
             else:
                 raise EstoqueInsuficienteError(f"Estoque insuficiente para a Joia ID {joia_id}.")
         except self.JoiaModel.DoesNotExist:
@@ -141,13 +306,20 @@ class JoiaRepositoryDjango(IJoiaRepository):
     def deletar(self, joia_id: int):
         try:
             self.JoiaModel.objects.get(pk=joia_id).delete()
+            self._invalidar_memo_joia(joia_id)
         except self.JoiaModel.DoesNotExist:
             raise JoiaNaoEncontradaError(f"Joia ID {joia_id} não pode ser deletada, pois não existe.")
             
     def buscar_categorias_destaque(self) -> List[Categoria]:
         """Retorna as categorias em destaque, usando o Django ORM."""
+        entities = cache.get(CATEGORIAS_DESTAQUE_CACHE_KEY)
+        if entities is not None:
+            return entities
+
         categorias = self.CategoriaModel.objects.filter(em_destaque=True)
-        return [CategoriaMapper.to_entity(model) for model in categorias]
+        entities = [CategoriaMapper.to_entity(model) for model in categorias]
+        cache.set(CATEGORIAS_DESTAQUE_CACHE_KEY, entities, _CATALOGO_CACHE_TIMEOUT)
+        return entities
 
 
 class CarrinhoRepositoryDjango(ICarrinhoRepository):
@@ -166,11 +338,12 @@ class CarrinhoRepositoryDjango(ICarrinhoRepository):
         try:
             # Tenta encontrar o carrinho e pré-carrega os itens com as joias relacionadas
             carrinho_model = self.CarrinhoModel.objects.select_related('usuario').prefetch_related(
-                # Usamos Prefetch para garantir que a joia e categoria/subcategoria sejam carregadas
+                # Usamos Prefetch para garantir que a joia e categoria/subcategoria sejam carregadas.
+                # Sem to_attr: o CarrinhoMapper itera model.itens.all(), que só
+                # aproveita o cache do prefetch quando ele popula a relação padrão.
                 Prefetch(
-                    'itens_carrinho', # Related name CORRIGIDO
+                    'itens',
                     queryset=self.ItemCarrinhoModel.objects.select_related('joia__categoria', 'joia__subcategoria'),
-                    to_attr='itens_list_for_mapper' # Nome do atributo para o mapper
                 )
             ).get(usuario__user_id=usuario.id) # Assumindo que o FK é 'usuario' que aponta para User
         except self.CarrinhoModel.DoesNotExist:
@@ -194,99 +367,141 @@ class CarrinhoRepositoryDjango(ICarrinhoRepository):
         
         if not carrinho.id:
             raise ValueError("Carrinho deve ter um ID para ser salvo (obtido via buscar_por_usuario).")
-        
+
         try:
-            carrinho_model = self.CarrinhoModel.objects.get(pk=carrinho.id)
+            # Trava só a linha deste carrinho (of=('self',)): mutações
+            # concorrentes do mesmo usuário (duplo clique) serializam aqui,
+            # sem contenção entre carrinhos distintos.
+            carrinho_model = self.CarrinhoModel.objects.select_for_update(
+                of=('self',)
+            ).get(pk=carrinho.id)
         except self.CarrinhoModel.DoesNotExist:
             raise ItemNaoEncontradoError(f"Carrinho ID {carrinho.id} não existe.")
         
         # 1. Identifica os Joia IDs que devem estar no carrinho e suas quantidades
         joia_ids_atuais = {item.joia_id: item.quantidade for item in carrinho.itens}
-        
-        # 2. Sincroniza os itens:
-        
-        itens_existentes = self.ItemCarrinhoModel.objects.filter(carrinho=carrinho_model)
-        
+
+        # 2. Sincroniza os itens via diff: um bulk_create para os novos, um
+        # bulk_update para as quantidades alteradas e um delete para os
+        # removidos — 3 statements no total, independente do tamanho do carrinho.
+        itens_existentes = {
+            str(item.joia_id): item
+            for item in self.ItemCarrinhoModel.objects.filter(carrinho=carrinho_model)
+        }
+
         itens_a_criar = []
-        joia_ids_existentes_no_db = set()
-        
+        itens_a_atualizar = []
+
         for item_entity in carrinho.itens:
-            encontrado = False
-            for item_model in itens_existentes:
-                if str(item_model.joia_id) == str(item_entity.joia_id):
-                    # Item existente: Atualiza
-                    if item_model.quantidade != item_entity.quantidade:
-                        item_model.quantidade = item_entity.quantidade
-                        item_model.save()
-                    joia_ids_existentes_no_db.add(item_entity.joia_id)
-                    encontrado = True
-                    break
-            
-            if not encontrado:
-                # Item novo: Cria um novo ItemCarrinhoModel
-                # O mapper deve ser adaptado para usar o CarrinhoModel
-                item_model = self.ItemCarrinhoModel(
-                    carrinho=carrinho_model, 
-                    joia_id=item_entity.joia_id, 
+            item_model = itens_existentes.get(str(item_entity.joia_id))
+            if item_model is not None:
+                # Item existente: atualiza a quantidade se mudou
+                if item_model.quantidade != item_entity.quantidade:
+                    item_model.quantidade = item_entity.quantidade
+                    itens_a_atualizar.append(item_model)
+            else:
+                # Item novo: cria um novo ItemCarrinhoModel
+                itens_a_criar.append(self.ItemCarrinhoModel(
+                    carrinho=carrinho_model,
+                    joia_id=item_entity.joia_id,
                     quantidade=item_entity.quantidade,
                     preco_unitario=item_entity.preco_unitario
-                )
-                itens_a_criar.append(item_model)
-                
+                ))
+
         if itens_a_criar:
-            self.ItemCarrinhoModel.objects.bulk_create(itens_a_criar)
-            
+            self.ItemCarrinhoModel.objects.bulk_create(itens_a_criar, batch_size=500)
+
+        if itens_a_atualizar:
+            self.ItemCarrinhoModel.objects.bulk_update(
+                itens_a_atualizar, ['quantidade'], batch_size=500
+            )
+
         # 3. Deleta itens que foram removidos da entidade
+        ids_atuais = {str(joia_id) for joia_id in joia_ids_atuais}
         joias_para_excluir_ids = [
-            item.joia_id for item in itens_existentes
-            if item.joia_id not in joia_ids_atuais
+            joia_id for joia_id in itens_existentes
+            if joia_id not in ids_atuais
         ]
-        
-        self.ItemCarrinhoModel.objects.filter(
-            carrinho=carrinho_model, 
-            joia_id__in=joias_para_excluir_ids
-        ).delete()
-        
-        carrinho_model.save() 
+
+        if joias_para_excluir_ids:
+            self.ItemCarrinhoModel.objects.filter(
+                carrinho=carrinho_model,
+                joia_id__in=joias_para_excluir_ids
+            ).delete()
+
+        carrinho_model.save()
         
         return carrinho
 
     @transaction.atomic
-    def salvar_item(self, carrinho: Carrinho, item: ItemCarrinho) -> None:
+    def salvar_item(self, carrinho: Carrinho, joia_id: str, quantidade_adicionada: int) -> Carrinho:
         """
-        Salva um item específico no carrinho.
+        Adiciona (ou incrementa) o item da joia no carrinho.
         """
         try:
-            carrinho_model = self.CarrinhoModel.objects.get(pk=carrinho.id)
-            # Tenta encontrar o item existente
-            item_model, created = self.ItemCarrinhoModel.objects.get_or_create(
-                carrinho=carrinho_model,
-                joia_id=item.joia_id,
-                defaults={'quantidade': item.quantidade, 'preco_unitario': item.preco_unitario}
-            )
-            
-            if not created:
-                # Atualiza a quantidade se já existia
-                item_model.quantidade = item.quantidade
-                item_model.save()
-                
+            # Mesma serialização por carrinho do salvar(): dois "adicionar"
+            # simultâneos do mesmo usuário não se atropelam no get_or_create.
+            carrinho_model = self.CarrinhoModel.objects.select_for_update(
+                of=('self',)
+            ).get(pk=carrinho.id)
         except self.CarrinhoModel.DoesNotExist:
             raise ItemNaoEncontradoError(f"Carrinho ID {carrinho.id} não existe.")
 
+        item_existente = carrinho.obter_item(joia_id)
+        if item_existente is not None:
+            preco_unitario = item_existente.preco_unitario
+        else:
+            # Item novo no carrinho: o preço do snapshot vem do catálogo.
+            preco_unitario = get_model('catalog', 'Joia').objects.values_list(
+                'preco', flat=True
+            ).get(pk=joia_id)
+
+        item_model, created = self.ItemCarrinhoModel.objects.get_or_create(
+            carrinho=carrinho_model,
+            joia_id=joia_id,
+            defaults={'quantidade': quantidade_adicionada, 'preco_unitario': preco_unitario}
+        )
+
+        if not created:
+            # Incrementa a quantidade se já existia
+            item_model.quantidade += quantidade_adicionada
+            item_model.save()
+
+        # Espelha a mutação na entidade para devolver o carrinho atualizado
+        # sem reidratar do banco.
+        if item_existente is not None:
+            carrinho.atualizar_quantidade(
+                joia_id, item_existente.quantidade + quantidade_adicionada
+            )
+        else:
+            carrinho.adicionar_item(ItemCarrinho(
+                joia_id=joia_id,
+                quantidade=quantidade_adicionada,
+                preco_unitario=preco_unitario,
+            ))
+
+        return carrinho
+
     @transaction.atomic
-    def remover_item(self, carrinho: Carrinho, joia_id: str) -> None:
+    def remover_item(self, carrinho: Carrinho, joia_id: str) -> Carrinho:
         """
         Remove um item específico do carrinho.
+
+        Um único DELETE filtrado por (carrinho_id, joia_id): não há por que
+        carregar o CarrinhoModel antes — o rowcount do próprio DELETE já
+        diz se o item existia.
         """
-        try:
-            carrinho_model = self.CarrinhoModel.objects.get(pk=carrinho.id)
-            self.ItemCarrinhoModel.objects.filter(
-                carrinho=carrinho_model,
-                joia_id=joia_id
-            ).delete()
-        except self.CarrinhoModel.DoesNotExist:
-            # Se o carrinho não existe, podemos simplesmente ignorar ou levantar um erro
-            raise ItemNaoEncontradoError(f"Carrinho ID {carrinho.id} não existe.")
+        removidos, _ = self.ItemCarrinhoModel.objects.filter(
+            carrinho_id=carrinho.id,
+            joia_id=joia_id
+        ).delete()
+        if removidos == 0:
+            # Carrinho inexistente ou item já removido por outra request.
+            raise ItemNaoEncontradoError(
+                f"Item da Joia ID {joia_id} não encontrado no carrinho {carrinho.id}."
+            )
+        carrinho.remover_item(joia_id)
+        return carrinho
 
     @transaction.atomic
     def limpar_carrinho(self, usuario: Usuario):
@@ -298,6 +513,38 @@ class CarrinhoRepositoryDjango(ICarrinhoRepository):
             pass # Se o carrinho não existe, não há o que limpar
 
 
+class _ListaPreguicosaDePedidos:
+    """
+    Sequência preguiçosa sobre um queryset de pedidos.
+
+    As listagens devolviam List[Pedido] completo, mapeando todas as linhas
+    (e seus itens prefetchados) antes de a view começar a renderizar. O
+    Paginator do Django só precisa de len() e de um slice, então aqui só
+    as linhas da página pedida viram entidades; iterar direto (histórico
+    do cliente) faz streaming do cursor em blocos de 200.
+    """
+
+    def __init__(self, queryset):
+        self._qs = queryset
+
+    def __len__(self):
+        return self._qs.count()
+
+    def __bool__(self):
+        # `{% if pedidos %}` nos templates não deve materializar nada.
+        return self._qs.exists()
+
+    def __iter__(self):
+        for model in self._qs.iterator(chunk_size=200):
+            yield PedidoMapper.to_entity(model)
+
+    def __getitem__(self, indice):
+        resultado = self._qs[indice]
+        if isinstance(indice, slice):
+            return [PedidoMapper.to_entity(model) for model in resultado]
+        return PedidoMapper.to_entity(resultado)
+
+
 class PedidoRepositoryDjango(IPedidoRepository):
     """Implementação do PedidoRepository usando o Django ORM."""
     
@@ -314,22 +561,41 @@ class PedidoRepositoryDjango(IPedidoRepository):
     def JoiaModel(self):
         return get_model('catalog', 'Joia')
 
+    def _queryset_com_itens(self):
+        """QuerySet base com usuário e itens→joia pré-carregados (evita N+1 no mapeamento)."""
+        return self.PedidoModel.objects.select_related('usuario').prefetch_related(
+            Prefetch(
+                'itens',
+                queryset=self.ItemPedidoModel.objects.select_related('joia'),
+            )
+        )
+
     def buscar_por_id(self, pedido_id: int) -> Optional[Pedido]:
+        # Memo por request (detalhe + checagem de permissão batem aqui
+        # mais de uma vez no mesmo ciclo); fora de um request, memo is None.
+        memo = obter_pedido_cache()
+        if memo is not None and pedido_id in memo:
+            return memo[pedido_id]
+
         try:
-            # Pré-carrega itens e o usuário para o mapeamento completo
+            # Pré-carrega itens e o usuário para o mapeamento completo.
+            # Sem to_attr: o PedidoMapper itera model.itens.all().
             model = self.PedidoModel.objects.select_related('usuario').prefetch_related(
                 Prefetch(
-                    'itens', 
-                    queryset=self.ItemPedidoModel.objects.select_related('joia'), 
-                    to_attr='itens_list_for_mapper'
+                    'itens',
+                    queryset=self.ItemPedidoModel.objects.select_related('joia'),
                 )
             ).get(pk=pedido_id)
-            return PedidoMapper.to_entity(model)
+            entity = PedidoMapper.to_entity(model)
         except self.PedidoModel.DoesNotExist:
-            return None
+            entity = None
+
+        if memo is not None:
+            memo[pedido_id] = entity
+        return entity
 
     def listar(self, usuario: Optional[Usuario] = None) -> List[Pedido]:
-        qs = self.PedidoModel.objects.all().select_related('usuario')
+        qs = self._queryset_com_itens()
         if usuario:
             qs = qs.filter(usuario__user_id=usuario.id)
         qs = qs.order_by('-data_pedido')
@@ -341,10 +607,10 @@ class PedidoRepositoryDjango(IPedidoRepository):
         para a dashboard administrativa.
         """
         try:
-            pedidos_recentes_models = self.PedidoModel.objects.all().order_by('-data_pedido')[:limite]
+            pedidos_recentes_models = self._queryset_com_itens().order_by('-data_pedido')[:limite]
             return [PedidoMapper.to_entity(model) for model in pedidos_recentes_models]
         except Exception as e:
-            print(f"Erro ao listar pedidos recentes no repositório: {e}")
+            logger.error("Erro ao listar pedidos recentes no repositório: %s", e)
             return []
 
     def contar_total(self, status: Optional[str] = None) -> int:
@@ -358,52 +624,106 @@ class PedidoRepositoryDjango(IPedidoRepository):
         return qs.count()
 
     @transaction.atomic
-    def criar_pedido(self, pedido: Pedido) -> Pedido:
+    def criar_pedido(self, pedido: Pedido, carrinho_id=None, estoque_updates=None) -> Pedido:
         """
-        Cria um novo pedido no banco de dados.
+        Cria o pedido, baixa o estoque e limpa o carrinho em uma única
+        transação atômica.
         """
         model = PedidoMapper.to_model(pedido)
-        
+
         # Garante que o usuário existe no DB e associa
         try:
-            user_model = User.objects.get(pk=pedido.usuario_id)
+            user_model = User.objects.get(pk=pedido.usuario.id)
             model.usuario_id = user_model.id
         except User.DoesNotExist:
-            raise ValueError(f"Usuário ID {pedido.usuario_id} não encontrado.")
-            
+            raise ValueError(f"Usuário ID {pedido.usuario.id} não encontrado.")
+
         model.save()
-        
+
         pedido.id = model.id
-        
+
         # Salva os itens do pedido
         item_models = [
             ItemPedidoMapper.to_model(item, pedido_id=model.id)
             for item in pedido.itens
         ]
         self.ItemPedidoModel.objects.bulk_create(item_models)
-        
-        # Baixa o estoque das joias
-        
-        joia_ids = [item.joia_id for item in pedido.itens]
-        joias_com_estoque = self.JoiaModel.objects.filter(pk__in=joia_ids).in_bulk()
-        
-        for item in pedido.itens:
-            joia_model = joias_com_estoque.get(item.joia_id)
-            if not joia_model or joia_model.estoque < item.quantidade:
-                raise EstoqueInsuficienteError(f"Estoque insuficiente para a Joia ID {item.joia_id}.")
-            
-            # Atualiza o estoque usando F expression (atomic update)
-            self.JoiaModel.objects.filter(pk=item.joia_id).update(
-                estoque=F('estoque') - item.quantidade
+
+        # Baixa o estoque das joias em um único UPDATE condicional (CASE
+        # WHEN): o WHERE só casa a linha se o estoque dela ainda comporta a
+        # quantidade pedida, então checagem e débito são a mesma operação —
+        # sem janela de lost-update entre checkouts concorrentes e sem o
+        # custo de serialização do select_for_update.
+        # estoque_updates chega como sequência de pares (joia_id, qtde) —
+        # o fluxo aqui é só iteração, sem lookup aleatório, então não há
+        # por que pagar a montagem/hashing de um dict no chamador.
+        if estoque_updates is None:
+            estoque_updates = [(item.joia_id, item.quantidade) for item in pedido.itens]
+        elif isinstance(estoque_updates, dict):
+            # Compatibilidade com chamadores antigos que montavam dict.
+            estoque_updates = list(estoque_updates.items())
+
+        joia_ids = [joia_id for joia_id, _ in estoque_updates]
+
+        filtro_com_estoque = Q()
+        for joia_id, quantidade in estoque_updates:
+            filtro_com_estoque |= Q(pk=joia_id, estoque__gte=quantidade)
+
+        whens = [
+            When(pk=joia_id, then=F('estoque') - quantidade)
+            for joia_id, quantidade in estoque_updates
+        ]
+        atualizadas = self.JoiaModel.objects.filter(filtro_com_estoque).update(
+            estoque=Case(*whens, default=F('estoque'), output_field=IntegerField())
+        )
+        if atualizadas != len(estoque_updates):
+            # Alguma linha não casou o filtro (estoque esgotado entre a
+            # validação do use case e o commit, ou joia removida). A
+            # exceção desfaz a transação inteira, inclusive os débitos
+            # das linhas que casaram.
+            raise EstoqueInsuficienteError(
+                "Estoque insuficiente para um ou mais itens do pedido."
             )
 
+        # .update() não dispara post_save — invalida o cache das joias
+        # afetadas manualmente para o estoque não ficar obsoleto no Redis.
+        cache.delete_many([JOIA_CACHE_KEY % joia_id for joia_id in joia_ids])
+        # A listagem cacheada também reflete estoque: bump de versão.
+        invalidar_listagem_catalogo()
+        # O novo pedido precisa aparecer no "Meus Pedidos" do dono.
+        cache.delete(PEDIDOS_USUARIO_CACHE_KEY % pedido.usuario.id)
+
+        # Limpa o carrinho na mesma transação, quando informado
+        if carrinho_id is not None:
+            get_model('carrinho', 'ItemCarrinho').objects.filter(
+                carrinho_id=carrinho_id
+            ).delete()
+
         return PedidoMapper.to_entity(model)
 
-    def atualizar_status(self, pedido_id: int, novo_status: str) -> None:
+    def atualizar_status(
+        self, pedido_id: int, novo_status: str,
+        id_externo_pagamento: Optional[str] = None
+    ) -> Optional[Pedido]:
         """
-        Atualiza o status de um pedido.
+        Atualiza o status de um pedido (e o código de transação, quando o
+        webhook o informa) e devolve a entidade atualizada.
         """
-        self.PedidoModel.objects.filter(pk=pedido_id).update(status=novo_status)
+        usuario_id = self.PedidoModel.objects.filter(pk=pedido_id).values_list(
+            'usuario_id', flat=True
+        ).first()
+        campos = {'status': novo_status}
+        if id_externo_pagamento is not None:
+            campos['codigo_transacao'] = id_externo_pagamento
+        self.PedidoModel.objects.filter(pk=pedido_id).update(**campos)
+        # Mantém o memo do request coerente com o novo status.
+        memo = obter_pedido_cache()
+        if memo is not None:
+            memo.pop(pedido_id, None)
+        if usuario_id is not None:
+            cache.delete(PEDIDOS_USUARIO_CACHE_KEY % usuario_id)
+        # O caso de uso do webhook usa o retorno para notificar o cliente.
+        return self.buscar_por_id(pedido_id)
 
     @transaction.atomic
     def salvar(self, pedido: Pedido) -> Pedido:
@@ -420,28 +740,44 @@ class PedidoRepositoryDjango(IPedidoRepository):
                 
         model = PedidoMapper.to_model(pedido, model)
         model.save()
-        
+        cache.delete(PEDIDOS_USUARIO_CACHE_KEY % model.usuario_id)
+
         return PedidoMapper.to_entity(model)
 
-    def listar_pedidos_por_usuario(self, usuario_id: str) -> List[Pedido]:
-        """Lista todos os pedidos de um usuário."""
+    def listar_pedidos_por_usuario(self, usuario_id: str) -> Iterable[Pedido]:
+        """
+        Lista todos os pedidos de um usuário.
+
+        O histórico de um usuário é pequeno e relido a cada visita ao
+        "Meus Pedidos": a lista mapeada fica no Redis por alguns minutos
+        e criar_pedido/atualizar_status/salvar derrubam a chave na escrita.
+        """
+        cache_key = PEDIDOS_USUARIO_CACHE_KEY % usuario_id
+        entities = cache.get(cache_key)
+        if entities is not None:
+            return entities
+
         # Filtra pelo ID do Usuario, que é o ID da entidade Usuario
-        qs = self.PedidoModel.objects.filter(usuario_id=usuario_id).order_by('-data_pedido') 
-        return [PedidoMapper.to_entity(model) for model in qs]
+        qs = self._queryset_com_itens().filter(usuario_id=usuario_id).order_by('-data_pedido')
+        entities = [
+            PedidoMapper.to_entity(model) for model in qs.iterator(chunk_size=200)
+        ]
+        cache.set(cache_key, entities, _PEDIDOS_USUARIO_CACHE_TIMEOUT)
+        return entities
 
-    def listar_todos_pedidos(self, status: Optional[str] = None) -> List[Pedido]:
-        """Lista todos os pedidos, opcionalmente filtrados por status."""
-        qs = self.PedidoModel.objects.all()
+    def listar_todos_pedidos(self, status: Optional[str] = None) -> Iterable[Pedido]:
+        """Lista todos os pedidos, opcionalmente filtrados por status (avaliação preguiçosa)."""
+        qs = self._queryset_com_itens()
         if status:
             qs = qs.filter(status=status)
         qs = qs.order_by('-data_pedido')
-        return [PedidoMapper.to_entity(model) for model in qs]
+        return _ListaPreguicosaDePedidos(qs)
 
     def buscar_por_transacao_id(self, transacao_id: str) -> Optional[Pedido]:
         """Busca um pedido pelo ID de transação do pagamento."""
-        # Se você adicionou um campo 'transacao_id' ao modelo Pedido
+        # O campo do model é codigo_transacao (indexado para este lookup).
         try:
-            model = self.PedidoModel.objects.get(transacao_id=transacao_id)
+            model = self._queryset_com_itens().get(codigo_transacao=transacao_id)
             return PedidoMapper.to_entity(model)
         except self.PedidoModel.DoesNotExist:
             return None
@@ -568,6 +904,15 @@ class JoiaRepository(IJoiaRepository):
         """Busca uma joia pelo seu ID."""
         return JOIAS_DB.get(str(id))
 
+    def buscar_por_ids(self, joia_ids: List[str]) -> Dict[str, Joia]:
+        """Busca várias joias de uma vez (in-memory)."""
+        resultado = {}
+        for joia_id in joia_ids:
+            joia = JOIAS_DB.get(str(joia_id))
+            if joia:
+                resultado[joia.id] = joia
+        return resultado
+
     def buscar_por_criterios(
         self, 
         em_estoque: bool = True, 
@@ -650,33 +995,37 @@ class CarrinhoRepository(ICarrinhoRepository):
         CARINHOS_DB[carrinho.usuario_id] = carrinho
         return carrinho
 
-    def salvar_item(self, carrinho: Carrinho, item: ItemCarrinho) -> None:
-        """Salva um item no carrinho."""
+    def salvar_item(self, carrinho: Carrinho, joia_id: str, quantidade_adicionada: int) -> Carrinho:
+        """Adiciona (ou incrementa) o item da joia no carrinho."""
         current_carrinho = CARINHOS_DB.get(carrinho.usuario_id)
         if not current_carrinho:
-            current_carrinho = Carrinho(id=str(uuid.uuid4()), usuario_id=carrinho.usuario_id, itens=[])
+            current_carrinho = carrinho
             CARINHOS_DB[carrinho.usuario_id] = current_carrinho
 
-        # Procura se o item já existe no carrinho
-        for i, existing_item in enumerate(current_carrinho.itens):
-            if existing_item.joia_id == item.joia_id:
-                # Atualiza a quantidade do item existente
-                current_carrinho.itens[i] = item
-                break
+        item_existente = current_carrinho.obter_item(joia_id)
+        if item_existente is not None:
+            current_carrinho.atualizar_quantidade(
+                joia_id, item_existente.quantidade + quantidade_adicionada
+            )
         else:
-            # Se não encontrou o item, adiciona ao carrinho
-            current_carrinho.itens.append(item)
+            joia = JOIAS_DB.get(str(joia_id))
+            if not joia:
+                raise ItemNaoEncontradoError(f"Jóia ID {joia_id} não encontrada.")
+            current_carrinho.adicionar_item(ItemCarrinho(
+                joia_id=joia_id,
+                quantidade=quantidade_adicionada,
+                preco_unitario=joia.preco,
+            ))
 
         CARINHOS_DB[carrinho.usuario_id] = current_carrinho
+        return current_carrinho
 
-    def remover_item(self, carrinho: Carrinho, joia_id: str) -> None:
+    def remover_item(self, carrinho: Carrinho, joia_id: str) -> Carrinho:
         """Remove um item do carrinho."""
-        current_carrinho = CARINHOS_DB.get(carrinho.usuario_id)
-        if current_carrinho:
-            current_carrinho.itens = [
-                item for item in current_carrinho.itens if item.joia_id != joia_id
-            ]
-            CARINHOS_DB[carrinho.usuario_id] = current_carrinho
+        current_carrinho = CARINHOS_DB.get(carrinho.usuario_id, carrinho)
+        current_carrinho.remover_item(joia_id)
+        CARINHOS_DB[carrinho.usuario_id] = current_carrinho
+        return current_carrinho
 
     def limpar_carrinho(self, usuario: Usuario):
         """Remove o carrinho do usuário após o checkout."""
@@ -721,11 +1070,17 @@ class PedidoRepository(IPedidoRepository):
         """Cria um novo pedido no repositório."""
         return self.salvar(pedido)
 
-    def atualizar_status(self, pedido_id: str, novo_status: str) -> None:
+    def atualizar_status(
+        self, pedido_id: str, novo_status: str,
+        id_externo_pagamento: Optional[str] = None
+    ) -> Optional[Pedido]:
         """Atualiza o status de um pedido."""
         if pedido := PEDIDOS_DB.get(pedido_id):
             pedido.status = novo_status
+            if id_externo_pagamento is not None:
+                pedido.transacao_id = id_externo_pagamento
             PEDIDOS_DB[pedido_id] = pedido
+        return pedido
 
     def listar_pedidos_por_usuario(self, usuario_id: str) -> List[Pedido]:
         """Lista todos os pedidos de um usuário específico."""
@@ -0,0 +1,32 @@
+"""
+Camada de Infraestrutura: Invalidação do cache Redis do catálogo.
+
+Os repositórios cacheiam joias por ID e a lista de categorias em destaque
+(ver repositories.py). Qualquer escrita via ORM nos modelos do catálogo
+remove as chaves correspondentes para que a próxima leitura re-hidrate do
+banco.
+"""
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .repositories import (
+    CATEGORIAS_DESTAQUE_CACHE_KEY,
+    JOIA_CACHE_KEY,
+    invalidar_listagem_catalogo,
+)
+
+
+@receiver([post_save, post_delete], sender='catalog.Joia')
+def invalidar_cache_joia(sender, instance, **kwargs):
+    """Remove a joia alterada/deletada do cache e versiona a listagem."""
+    cache.delete(JOIA_CACHE_KEY % instance.pk)
+    invalidar_listagem_catalogo()
+
+
+@receiver([post_save, post_delete], sender='catalog.Categoria')
+def invalidar_cache_categorias(sender, instance, **kwargs):
+    """Remove a lista de categorias em destaque do cache (menu de navegação)."""
+    cache.delete(CATEGORIAS_DESTAQUE_CACHE_KEY)
+    # Listagens filtradas por categoria_slug também ficam obsoletas.
+    invalidar_listagem_catalogo()
@@ -0,0 +1,95 @@
+"""
+Camada de Infraestrutura: Tasks Celery de notificação.
+
+As confirmações de pedido (e-mail/WhatsApp) são chamadas HTTP/SMTP de
+100–500 ms cada; rodando no worker, o usuário recebe a página de
+confirmação sem esperar por elas. As tasks recebem apenas o ID do pedido
+(serializável em JSON) e re-hidratam a entidade no worker.
+"""
+import logging
+
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def enviar_confirmacao_pedido_email(pedido_id):
+    """Envia o e-mail de confirmação do pedido fora do ciclo de request."""
+    # Imports locais: os repositórios/gateways puxam os models do Django,
+    # que só podem ser carregados depois do setup das apps.
+    from .gateways import EmailServiceGateway
+    from .repositories import PedidoRepositoryDjango
+
+    pedido = PedidoRepositoryDjango().buscar_por_id(pedido_id)
+    if not pedido:
+        logger.warning("Pedido %s não encontrado para e-mail de confirmação.", pedido_id)
+        return False
+    return EmailServiceGateway().enviar_confirmacao_pedido(pedido)
+
+
+@shared_task
+def enviar_confirmacao_pedido_whatsapp(pedido_id, numero_telefone):
+    """Envia a confirmação do pedido por WhatsApp fora do ciclo de request."""
+    from .gateways import EvolutionAPIGateway
+    from .repositories import PedidoRepositoryDjango
+
+    pedido = PedidoRepositoryDjango().buscar_por_id(pedido_id)
+    if not pedido:
+        logger.warning("Pedido %s não encontrado para WhatsApp de confirmação.", pedido_id)
+        return False
+    return EvolutionAPIGateway().enviar_confirmacao_pedido(pedido, numero_telefone)
+
+
+@shared_task
+def enviar_aprovacao_pagamento_email(pedido_id):
+    """Envia o e-mail de aprovação de pagamento fora do ciclo de request."""
+    from .gateways import EmailServiceGateway
+    from .repositories import PedidoRepositoryDjango
+
+    pedido = PedidoRepositoryDjango().buscar_por_id(pedido_id)
+    if not pedido:
+        logger.warning("Pedido %s não encontrado para e-mail de aprovação.", pedido_id)
+        return False
+    return EmailServiceGateway().enviar_aprovacao_pagamento(pedido)
+
+
+@shared_task
+def processar_webhook_pagamento(transacao_id):
+    """
+    Processa uma notificação de pagamento (IPN) fora do worker web.
+
+    O endpoint do webhook só valida e enfileira o transacao_id; quem paga
+    o HTTP de verificar_status, a escrita no banco e as notificações é o
+    worker — rajadas de IPN em promoção não saturam os workers web.
+    """
+    from vejoias.core.use_cases import AtualizarStatusPedidoPorTransacaoUseCase
+
+    from .gateways import (
+        EmailServiceGateway,
+        EvolutionAPIGateway,
+        MercadoPagoGateway,
+        NotificacaoCeleryTaskQueue,
+    )
+    from .repositories import PedidoRepositoryDjango
+
+    AtualizarStatusPedidoPorTransacaoUseCase(
+        pedido_repo=PedidoRepositoryDjango(),
+        pagamento_gateway=MercadoPagoGateway(),
+        email_service=EmailServiceGateway(),
+        whatsapp_gateway=EvolutionAPIGateway(),
+        task_queue=NotificacaoCeleryTaskQueue(),
+    ).executar(transacao_id)
+
+
+@shared_task
+def enviar_aprovacao_pagamento_whatsapp(pedido_id, numero_telefone):
+    """Envia a aprovação de pagamento por WhatsApp fora do ciclo de request."""
+    from .gateways import EvolutionAPIGateway
+    from .repositories import PedidoRepositoryDjango
+
+    pedido = PedidoRepositoryDjango().buscar_por_id(pedido_id)
+    if not pedido:
+        logger.warning("Pedido %s não encontrado para WhatsApp de aprovação.", pedido_id)
+        return False
+    return EvolutionAPIGateway().enviar_aprovacao_pagamento(pedido, numero_telefone)
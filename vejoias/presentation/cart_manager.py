@@ -90,7 +90,7 @@ class CartManager:
             return
             
         # Tenta encontrar o item existente
-        existing_item = self.carrinho.get_item(joia_id)
+        existing_item = self.carrinho.obter_item(joia_id)
 
         if existing_item:
             nova_quantidade = existing_item.quantidade + quantidade
@@ -103,7 +103,8 @@ class CartManager:
             # Em uma aplicação real, você deve retornar uma mensagem de erro aqui
 
         if existing_item:
-            existing_item.quantidade = nova_quantidade
+            # Via atualizar_quantidade para manter o total cacheado em dia
+            self.carrinho.atualizar_quantidade(joia_id, nova_quantidade)
         else:
             new_item = ItemCarrinho(
                 joia_id=joia_entity.id,
@@ -111,13 +112,13 @@ class CartManager:
                 preco_unitario=joia_entity.preco,
                 quantidade=nova_quantidade
             )
-            self.carrinho.itens.append(new_item)
+            self.carrinho.adicionar_item(new_item)
 
         self._save_carrinho_to_session()
 
     def remove_item(self, joia_id: int):
         """Remove completamente um item do carrinho."""
-        self.carrinho.itens = [item for item in self.carrinho.itens if item.joia_id != joia_id]
+        self.carrinho.remover_item(joia_id)
         self._save_carrinho_to_session()
 
     def update_quantity(self, joia_id: int, quantidade: int):
@@ -134,9 +135,7 @@ class CartManager:
         # Verifica o estoque
         quantidade_final = min(quantidade, joia_entity.estoque)
 
-        existing_item = self.carrinho.get_item(joia_id)
-        if existing_item:
-            existing_item.quantidade = quantidade_final
+        if self.carrinho.atualizar_quantidade(joia_id, quantidade_final):
             self._save_carrinho_to_session()
         # Se não existir, a função add_item pode ser usada, mas para update, só fazemos se já estiver lá.
 
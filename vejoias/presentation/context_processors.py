@@ -1,6 +1,9 @@
 """
 Context processors para a aplicação presentation.
 """
+import logging
+
+logger = logging.getLogger(__name__)
 
 def carrinho_context(request):
     """
@@ -30,5 +33,5 @@ def carrinho_context(request):
 
     except Exception as e:
         # Em caso de erro, retorna um dicionário vazio para não quebrar o template
-        print(f"Erro ao processar carrinho_context: {e}")
+        logger.error("Erro ao processar carrinho_context: %s", e)
         return {}
\ No newline at end of file
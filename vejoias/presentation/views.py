@@ -1,3 +1,5 @@
+import logging
+
 from django.views import View
 from django.views.generic import ListView, DetailView, View as BaseView
 from django.urls import reverse
@@ -17,11 +19,17 @@ from rest_framework import status
 import requests
 
 from vejoias.infrastructure.repositories import (
-    JoiaRepository,
-    CarrinhoRepository,
-    PedidoRepository,
+    JoiaRepositoryDjango,
+    CarrinhoRepositoryDjango,
+    PedidoRepositoryDjango,
+)
+from vejoias.infrastructure.gateways import (
+    MercadoPagoGateway,
+    EvolutionAPICeleryGateway,
+    EmailServiceCeleryGateway,
+    NotificacaoCeleryTaskQueue,
 )
-from vejoias.infrastructure.gateways import MercadoPagoGateway, EvolutionAPIGateway, EmailServiceGateway
+from vejoias.infrastructure import tasks
 from vejoias.core.use_cases import GerenciarCarrinhoUseCase, ListarPedidosDoUsuarioUseCase, CriarPedidoUseCase
 from vejoias.core.exceptions import (
     EstoqueInsuficienteError,
@@ -37,17 +45,28 @@ from .forms import AdicionarItemCarrinhoForm, CheckoutForm, RegistroForm, LoginF
 from vejoias.core.use_cases import GerenciarPedidosAdminUseCase
 
 
+logger = logging.getLogger(__name__)
+
+
 # ====================================================================
 # VIEWS: Orquestram a requisição, a execução dos casos de uso e a resposta.
 # ====================================================================
 
 # -- Instância dos Repositórios e Gateways (dependências) --
-joia_repo = JoiaRepository()
-carrinho_repo = CarrinhoRepository()
-pedido_repo = PedidoRepository()
+# Repositórios Django (Postgres): o worker Celery re-hidrata os pedidos
+# do banco, então o checkout precisa persistir na mesma base — as
+# variantes in-memory só servem para testes/desenvolvimento local.
+joia_repo = JoiaRepositoryDjango()
+carrinho_repo = CarrinhoRepositoryDjango()
+pedido_repo = PedidoRepositoryDjango()
 pagamento_gateway = MercadoPagoGateway()
-whatsapp_notifier = EvolutionAPIGateway()
-email_service = EmailServiceGateway()
+# Variantes Celery: a confirmação de pedido sai do caminho crítico do
+# checkout e roda no worker (e-mail/WhatsApp custam 100-500 ms cada).
+whatsapp_notifier = EvolutionAPICeleryGateway()
+email_service = EmailServiceCeleryGateway()
+# Fila de notificações: os casos de uso enfileiram só o ID do pedido e o
+# worker Celery paga os RTTs de SMTP/WhatsApp.
+notificacao_queue = NotificacaoCeleryTaskQueue()
 
 
 class UsuarioView(LoginRequiredMixin, View):
@@ -384,8 +403,9 @@ def processar_checkout(request):
                 pedido_repo,
                 joia_repo,
                 pagamento_gateway,
-                email_service, 
+                email_service,
                 whatsapp_notifier,
+                task_queue=notificacao_queue,
             )
 
             try:
@@ -550,6 +570,7 @@ class ProcessarCheckoutView(LoginRequiredMixin, View):
                 pagamento_gateway,
                 email_service,
                 whatsapp_notifier,
+                task_queue=notificacao_queue,
             )
 
             try:
@@ -669,6 +690,7 @@ class CheckoutAPIView(APIView):
                 pagamento_gateway=pagamento_gateway,
                 email_service=email_service,
                 whatsapp_gateway=whatsapp_notifier,
+                task_queue=notificacao_queue,
             )
 
             try:
@@ -696,18 +718,16 @@ class WebhookMercadoPago(APIView):
         topic = data.get('topic') 
         
         if topic == 'payment' and resource_id:
-            
-            gerenciar_pedidos_uc = GerenciarPedidosAdminUseCase(
-                pedido_repo=pedido_repo,
-                email_service=email_service,
-                whatsapp_gateway=whatsapp_notifier,
-            )
-            
+            # Só valida e enfileira: o worker Celery paga o HTTP ao
+            # gateway, a escrita no banco e as notificações. O endpoint
+            # responde em tempo de broker mesmo em rajada de IPNs.
             try:
-                gerenciar_pedidos_uc.atualizar_status_manual(pedido_id=resource_id, novo_status="PROCESSANDO")
+                tasks.processar_webhook_pagamento.delay(resource_id)
             except Exception as e:
-                print(f"Erro interno ao processar webhook {resource_id}: {e}")
+                logger.error("Erro ao enfileirar webhook %s: %s", resource_id, e)
+                # Broker indisponível: 500 faz o gateway reenviar depois.
+                return Response(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
             return Response(status=status.HTTP_200_OK)
-        
+
         return Response(status=status.HTTP_400_BAD_REQUEST)
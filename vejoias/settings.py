@@ -43,7 +43,9 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
-    
+    # Índices GIN/trigram e ferramentas de busca do Postgres
+    'django.contrib.postgres',
+
     # Aplicações de Terceiros (Primeiro)
     'rest_framework', 
     'drf_spectacular',
@@ -72,6 +74,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Memo por request para lookups repetidos de pedido (ver infrastructure/middleware.py)
+    'vejoias.infrastructure.middleware.RequestCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'vejoias.urls'
@@ -111,6 +115,16 @@ DATABASES = {
         'PASSWORD': config('POSTGRES_PASSWORD', default='postgres'),
         'HOST': config('POSTGRES_HOST', default='db'),
         'PORT': config('POSTGRES_PORT', default='5432'),
+        # Reutiliza a conexão TCP/TLS/auth entre requisições em vez de abrir
+        # e fechar uma conexão nova por request (CONN_MAX_AGE=0 padrão).
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        # Detecta sockets obsoletos antes de disparar a primeira query.
+        'CONN_HEALTH_CHECKS': True,
+        # Necessário quando há PgBouncer em modo de transação na frente do
+        # Postgres (cursores server-side não sobrevivem ao pooling).
+        'DISABLE_SERVER_SIDE_CURSORS': config(
+            'DB_DISABLE_SERVER_SIDE_CURSORS', default=False, cast=bool
+        ),
     }
 }
 
@@ -129,6 +143,14 @@ CACHES = {
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
 
+# Celery — fila de tarefas para tirar e-mail/WhatsApp do ciclo de request.
+# Usa o mesmo Redis do cache, em outro database.
+CELERY_BROKER_URL = f"redis://{config('REDIS_HOST', default='redis')}:6379/0"
+CELERY_RESULT_BACKEND = CELERY_BROKER_URL
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_RESULT_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
 
 # ====================================================================
 # AUTENTICAÇÃO E VALIDAÇÃO DE SENHA
@@ -149,6 +171,12 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hasher rápido durante os testes: o PBKDF2 padrão (~100k iterações) domina
+# o tempo de testes que criam usuários via CustomUserManager.create_user.
+# Não afeta produção — o guard só vale para `manage.py test`.
+if 'test' in sys.argv:
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 # Configurações de Autenticação
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-29 09:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pedido',
+            name='codigo_transacao',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+    ]
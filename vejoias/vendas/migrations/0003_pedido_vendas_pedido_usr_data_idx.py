@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-29 09:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0002_alter_pedido_codigo_transacao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='pedido',
+            index=models.Index(fields=['usuario', '-data_pedido'], name='vendas_pedido_usr_data_idx'),
+        ),
+    ]
@@ -36,7 +36,9 @@ class Pedido(models.Model):
         ('pix', 'PIX'),
     ]
     forma_pagamento = models.CharField(max_length=10, choices=FORMA_PAGAMENTO_CHOICES)
-    codigo_transacao = models.CharField(max_length=100, blank=True, null=True)
+    # Indexado: o webhook de pagamento resolve o pedido por este código
+    # a cada notificação do gateway.
+    codigo_transacao = models.CharField(max_length=100, blank=True, null=True, db_index=True)
 
     # Dados de Entrega (snapshot do endereço no momento do pedido)
     nome_entrega = models.CharField(max_length=255)
@@ -58,6 +60,14 @@ class Pedido(models.Model):
         verbose_name_plural = 'Pedidos'
         db_table = 'vendas_pedido'
         ordering = ['-data_pedido']
+        indexes = [
+            # "Meus Pedidos" e a listagem do admin filtram por usuário e
+            # ordenam por data: o índice composto serve o ORDER BY direto.
+            models.Index(
+                fields=['usuario', '-data_pedido'],
+                name='vendas_pedido_usr_data_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Pedido #{self.id} - {self.usuario.email}"